@@ -1,50 +1,598 @@
+import argparse
+import json
+import mmap
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+# NumPy is optional: without it everything runs on the pure-Python translate tables
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # List of letters used to calculate the shift based on index positions
 alphabet = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i', 'j', 'k', 'l', 'm', 'n', 'o', 'p', 'q', 'r', 's', 't', 'u', 'v', 'w', 'x', 'y', 'z']
 
-# Gather user preferences and input data
-direction = input("Type 'encode' to encrypt, type 'decode' to decrypt:\n").lower()
-text = input("Type your message:\n").lower()
-shift = int(input("Type the shift number:\n"))
+# Which engine handles numeric byte data: "numpy" when it is installed, otherwise "table"
+BACKEND = "numpy" if np is not None else "table"
+
+
+# --- NumPy Backend ---
+
+def shift_array(array, shift_amount):
+    """
+    Shifts the a-z bytes of a numpy.uint8 array in one vectorised pass and returns a new array.
+    Every other byte (capitals, digits, spaces, newlines...) is copied through untouched.
+    """
+    # Subtracting ord('a') wraps everything outside a-z to 26 or more (uint8 arithmetic)
+    shifted = array - ord('a')
+    is_letter = shifted < len(alphabet)
+    shifted += shift_amount % len(alphabet)
+    shifted %= len(alphabet)
+    shifted += ord('a')
+    np.copyto(shifted, array, where=~is_letter)
+    return shifted
+
+
+def check_array(array):
+    """Returns 'array' if it holds bytes (uint8); any other dtype would be silently corrupted."""
+    if array.dtype != np.uint8:
+        raise TypeError(f"NumPy input must be a uint8 array, not {array.dtype}")
+    return array
+
+
+# --- Table-Driven Codec ---
+
+class CaesarCodec:
+    """
+    Holds the precomputed translation tables for a single shift.
+    Whole strings (or bytes) are transformed with one str.translate / bytes.translate
+    call instead of looking up and concatenating every letter in Python.
+    """
+    def __init__(self, shift):
+        self.shift = shift % len(alphabet)
+        plain = "".join(alphabet)
+        # Rotate the alphabet so 'a' lines up with the letter 'shift' places later
+        shifted = plain[self.shift:] + plain[:self.shift]
+
+        # Text tables (used for str input)
+        self.encode_table = str.maketrans(plain, shifted)
+        self.decode_table = str.maketrans(shifted, plain)
+        # Byte tables (used for bytes/bytearray input, e.g. raw file data)
+        self.encode_bytes_table = bytes.maketrans(plain.encode(), shifted.encode())
+        self.decode_bytes_table = bytes.maketrans(shifted.encode(), plain.encode())
+
+    def encode(self, data):
+        """Shifts every a-z character forwards, leaving everything else untouched."""
+        if isinstance(data, str):
+            return data.translate(self.encode_table)
+        if BACKEND == "numpy" and isinstance(data, np.ndarray):
+            return shift_array(check_array(data), self.shift)
+        return data.translate(self.encode_bytes_table)
+
+    def decode(self, data):
+        """Shifts every a-z character backwards, leaving everything else untouched."""
+        if isinstance(data, str):
+            return data.translate(self.decode_table)
+        if BACKEND == "numpy" and isinstance(data, np.ndarray):
+            return shift_array(check_array(data), -self.shift)
+        return data.translate(self.decode_bytes_table)
+
+
+# One codec per possible shift, built once so no call ever rebuilds a table
+CODECS = [CaesarCodec(shift) for shift in range(len(alphabet))]
+
+
+def get_codec(shift_amount):
+    """Returns the cached codec for any shift (negative or larger than 25 wraps around)."""
+    return CODECS[shift_amount % len(alphabet)]
+
 
 def encrypt(original_text, shift_amount):
+    return get_codec(shift_amount).encode(original_text)
+
+
+def decrypt(original_text, shift_amount):
+    return get_codec(shift_amount).decode(original_text)
+
+
+# --- Frequency-Analysis Cracker ---
+
+# Relative frequency (%) of each letter a-z in typical English text
+ENGLISH_FREQUENCIES = [8.167, 1.492, 2.782, 4.253, 12.702, 2.228, 2.015, 6.094, 6.966, 0.153, 0.772, 4.025, 2.406,
+                       6.749, 7.507, 1.929, 0.095, 5.987, 6.327, 9.056, 2.758, 0.978, 2.360, 0.150, 1.974, 0.074]
+
+
+def letter_histogram(data, counts=None):
+    """
+    Counts how often each letter a-z appears, in a single pass over the text (str or bytes).
+    Pass an existing list as 'counts' to keep adding to it chunk by chunk.
+    """
+    if counts is None:
+        counts = [0] * len(alphabet)
+    if BACKEND == "numpy" and not isinstance(data, str):
+        # bincount tallies every byte value in C; a-z are the 26 slots starting at ord('a')
+        array = check_array(data) if isinstance(data, np.ndarray) else np.frombuffer(data, dtype=np.uint8)
+        tally = np.bincount(array, minlength=256)[ord('a'):ord('a') + len(alphabet)]
+        for index in range(len(alphabet)):
+            counts[index] += int(tally[index])
+        return counts
+
+    tally = Counter(data)
+    # Counter keys are characters for str input and integers for bytes input
+    keys = alphabet if isinstance(data, str) else [ord(letter) for letter in alphabet]
+    for index, key in enumerate(keys):
+        counts[index] += tally[key]
+    return counts
+
+
+def rank_shifts(counts):
+    """
+    Scores every possible shift with a chi-squared test against English letter frequencies.
+    Only the 26 counts are rotated, so the text itself is never decrypted while scoring.
+    Returns a list of (shift, score) pairs, best (lowest score) first.
+    """
+    total = sum(counts)
+    if total == 0:
+        # No letters at all: every shift is equally (un)likely
+        return [(shift, 0.0) for shift in range(len(alphabet))]
+
+    expected = [total * frequency / 100 for frequency in ENGLISH_FREQUENCIES]
+    scores = []
+    for shift in range(len(alphabet)):
+        score = 0.0
+        for index in range(len(alphabet)):
+            # Plain letter 'index' was encrypted into the letter 'shift' places later
+            observed = counts[(index + shift) % len(alphabet)]
+            score += (observed - expected[index]) ** 2 / expected[index]
+        scores.append((shift, score))
+    scores.sort(key=lambda pair: pair[1])
+    return scores
+
+
+def crack(cipher_text):
+    """Returns every shift ranked by how English the decrypted text would look."""
+    return rank_shifts(letter_histogram(cipher_text))
+
+
+def ceasar(original_text, shift_amount, direction):
+    # Determine which function to call based on user's choice
+    if direction == 'encode':
+        cipher = encrypt(original_text=original_text, shift_amount=shift_amount)
+        print(f"Here is the encrypted message: {cipher}")
+    elif direction == 'decode':
+        cipher = decrypt(original_text=original_text, shift_amount=shift_amount)
+        print(f"Here is the decrypted message: {cipher}")
+    elif direction == 'crack':
+        # The shift is unknown, so show the most likely candidates instead
+        for shift, score in crack(original_text)[:3]:
+            print(f"Shift {shift:2d} (score {score:8.1f}): {decrypt(original_text, shift)}")
+    else:
+        # Basic error handling for invalid direction inputs
+        print("Please enter either 'encode', 'decode' or 'crack':")
+
+
+# --- Streaming Mode ---
+
+# Size of each read when streaming files/stdin; memory use stays at roughly this much
+CHUNK_SIZE = 1024 * 1024
+
+
+def stream_transform(source, destination, shift_amount, direction, chunk_size=CHUNK_SIZE):
+    """
+    Reads a binary stream in fixed-size chunks and writes each transformed chunk straight out.
+    A Caesar shift works byte by byte, so chunk boundaries never split anything important.
+    """
+    transform = encrypt if direction == 'encode' else decrypt
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        destination.write(transform(chunk, shift_amount))
+    destination.flush()
+
+
+def run_stream(args):
+    """Opens the requested input/output (defaulting to stdin/stdout) and streams between them."""
+    source = open(args.input_path, "rb") if args.input_path else sys.stdin.buffer
+    destination = open(args.output_path, "wb") if args.output_path else sys.stdout.buffer
+    try:
+        stream_transform(source, destination, args.shift, args.direction, args.chunk_size)
+    finally:
+        if args.input_path:
+            source.close()
+        if args.output_path:
+            destination.close()
+
+
+def crack_stream(source, chunk_size=CHUNK_SIZE):
+    """Builds the letter histogram of a binary stream chunk by chunk and ranks all shifts."""
+    counts = [0] * len(alphabet)
+    preview = b""
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        if not preview:
+            # Keep the start of the text so the candidates can be shown to the user
+            preview = chunk[:60].split(b"\n")[0]
+        letter_histogram(chunk, counts)
+    return rank_shifts(counts), preview
+
+
+def run_crack(args):
+    """Prints the ranked shifts; with --in and --out, also writes the text decoded with the best one."""
+    source = open(args.input_path, "rb") if args.input_path else sys.stdin.buffer
+    try:
+        ranking, preview = crack_stream(source, args.chunk_size)
+    finally:
+        if args.input_path:
+            source.close()
+
+    for shift, score in ranking[:5]:
+        text = decrypt(preview, shift).decode(errors="replace")
+        print(f"Shift {shift:2d} (score {score:10.1f}): {text}")
+
+    if args.input_path and args.output_path:
+        best_shift = ranking[0][0]
+        with open(args.input_path, "rb") as source, open(args.output_path, "wb") as destination:
+            stream_transform(source, destination, best_shift, 'decode', args.chunk_size)
+
+
+# --- Parallel Mode ---
+
+def transform_range(input_path, output_path, start, length, shift_amount, direction, chunk_size=CHUNK_SIZE):
+    """
+    Worker job: memory-maps one slice of the input and output files and shifts it chunk by chunk.
+    'start' must be a multiple of mmap.ALLOCATIONGRANULARITY (parallel_transform takes care of that).
+    """
+    transform = encrypt if direction == 'encode' else decrypt
+    with open(input_path, "rb") as source, open(output_path, "r+b") as destination:
+        with mmap.mmap(source.fileno(), length, access=mmap.ACCESS_READ, offset=start) as in_map, \
+                mmap.mmap(destination.fileno(), length, offset=start) as out_map:
+            for position in range(0, length, chunk_size):
+                end = min(position + chunk_size, length)
+                out_map[position:end] = transform(in_map[position:end], shift_amount)
+    return length
+
+
+def parallel_transform(input_path, output_path, shift_amount, direction, workers, chunk_size=CHUNK_SIZE):
+    """
+    Splits a file into one range per worker and transforms the ranges in separate processes.
+    Each worker writes directly into a pre-sized output file, so nothing is merged afterwards.
+    """
+    if os.path.exists(output_path) and os.path.samefile(input_path, output_path):
+        raise ValueError("input_path and output_path must be different files")
+    size = os.path.getsize(input_path)
+    # Pre-size the output so every worker can map its own slice of it
+    with open(output_path, "wb") as destination:
+        destination.truncate(size)
+    if size == 0:
+        return
+
+    # Round each range up to the mmap granularity so every offset is valid
+    granularity = mmap.ALLOCATIONGRANULARITY
+    range_size = -(-size // workers)
+    range_size = -(-range_size // granularity) * granularity
+    ranges = [(start, min(range_size, size - start)) for start in range(0, size, range_size)]
+
+    if len(ranges) == 1:
+        # Not worth starting a process pool for a single slice
+        transform_range(input_path, output_path, 0, size, shift_amount, direction, chunk_size)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        jobs = [pool.submit(transform_range, input_path, output_path, start, length,
+                            shift_amount, direction, chunk_size)
+                for start, length in ranges]
+        for job in jobs:
+            # Re-raises any error from a worker
+            job.result()
+
+
+# --- Batch Mode ---
+
+# Records are handled in blocks so messages sharing a shift can be translated together
+BATCH_SIZE = 4096
+
+
+def record_error(text, shift, direction):
+    """Explains why batch() can't handle a record."""
+    if not isinstance(text, (str, bytes)):
+        return f"text must be str or bytes, not {text!r}"
+    if type(shift) is not int:
+        return f"shift must be an integer, not {shift!r}"
+    return f"direction must be 'encode' or 'decode', not {direction!r}"
+
+
+def batch(records, block_size=BATCH_SIZE):
+    """
+    Transforms an iterable of (text, shift, direction) records, yielding results in the same order.
+    Within each block, records are grouped by (direction, shift, str or bytes): every group is
+    joined into one string, translated with a single call to its cached codec and sliced back
+    into messages.
+    """
+    # Keyed by (direction, shift, text type): one lookup validates a whole record
+    transforms = {}
+    for codec in CODECS:
+        for kind in (str, bytes):
+            transforms['encode', codec.shift, kind] = codec.encode
+            transforms['decode', codec.shift, kind] = codec.decode
+
+    size = len(alphabet)
+    records = iter(records)
+    number = 0
+    while True:
+        block = list(islice(records, block_size))
+        if not block:
+            return
+
+        # Remember which positions in the block belong to each group
+        groups = {}
+        for position, (text, shift, direction) in enumerate(block):
+            # bool is an int subclass, so the exact type is checked; str and bytes never share a group
+            key = (direction, shift % size, type(text)) if type(shift) is int else None
+            if key not in transforms:
+                raise ValueError(f"Record {number + position + 1}: " + record_error(text, shift, direction))
+            groups.setdefault(key, []).append(position)
+
+        results = [None] * len(block)
+        for key, positions in groups.items():
+            texts = [block[position][0] for position in positions]
+            # texts[0][:0] is "" or b"", matching the type every message in the group shares
+            joined = transforms[key](texts[0][:0].join(texts))
+            offset = 0
+            for position, text in zip(positions, texts):
+                results[position] = joined[offset:offset + len(text)]
+                offset += len(text)
+
+        number += len(block)
+        yield from results
+
+
+def read_records(lines):
+    """Parses JSONL lines like {"text": "...", "shift": 3, "direction": "encode"} into batch records."""
+    for line in lines:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        yield record["text"], record["shift"], record["direction"]
+
+
+def run_batch(args):
+    """Streams JSONL records from --in/stdin to --out/stdout as {"text": result} lines."""
+    source = open(args.input_path, encoding="utf-8") if args.input_path else sys.stdin
+    destination = open(args.output_path, "w", encoding="utf-8") if args.output_path else sys.stdout
+    try:
+        for result in batch(read_records(source)):
+            destination.write(json.dumps({"text": result}) + "\n")
+        destination.flush()
+    finally:
+        if args.input_path:
+            source.close()
+        if args.output_path:
+            destination.close()
+
+
+# --- Benchmark ---
+
+def loop_encrypt(original_text, shift_amount):
+    """The original letter-by-letter implementation, kept as the benchmark baseline."""
     cipher_text = ""
     for letter in original_text:
-        # Check if the character is in our alphabet (ignores spaces/numbers/symbols)
         if letter in alphabet:
-            # Find the original index and add the shift
             shifted_position = alphabet.index(letter) + shift_amount
-            # Use modulo to wrap back to the start if position > 25
             shifted_position %= len(alphabet)
             cipher_text += alphabet[shifted_position]
         else:
-            # Keep non-alphabet characters (like spaces) as they are
             cipher_text += letter
     return cipher_text
 
-def decrypt(original_text, shift_amount):
-    cipher_text = ""
-    for letter in original_text:
-        if letter in alphabet:
-            # Subtract the shift to go backwards through the alphabet
-            shifted_position = alphabet.index(letter) - shift_amount
-            # Modulo works for negative numbers in Python, wrapping to the end
-            shifted_position %= len(alphabet)
-            cipher_text += alphabet[shifted_position]
+
+def check_parity():
+    """
+    Checks every engine against the original loop for every shift, in both directions, and
+    raises AssertionError on the first mismatch (plain checks, so they still run under -O).
+    """
+    text = "the quick brown fox jumps over the lazy dog, THE QUICK BROWN FOX! 1234567890 ~{}[]\n"
+    every_byte = bytes(range(256))
+    sample = text.encode() * 64
+    for shift in range(-len(alphabet), 2 * len(alphabet)):
+        expected = loop_encrypt(text, shift)
+        if encrypt(text, shift) != expected or decrypt(expected, shift) != text:
+            raise AssertionError(f"table codec (str) disagrees with the original loop for shift {shift}")
+        if encrypt(text.encode(), shift) != expected.encode():
+            raise AssertionError(f"table codec (bytes) disagrees with the original loop for shift {shift}")
+        if np is not None:
+            codec = get_codec(shift)
+            as_array = np.frombuffer(every_byte, dtype=np.uint8)
+            if (codec.encode(as_array).tobytes() != codec.encode(every_byte)
+                    or codec.decode(as_array).tobytes() != codec.decode(every_byte)):
+                raise AssertionError(f"numpy backend disagrees with the table codec for shift {shift}")
+    if letter_histogram(sample) != letter_histogram(sample.decode()):
+        raise AssertionError("letter histograms of the same text differ between str and bytes")
+    engines = "table and numpy backends" if np is not None else "table backend"
+    print(f"{engines} match the original loop for all shifts")
+
+
+def benchmark(size_mb=8):
+    """Prints the throughput (MB/s) of the original loop against the table codec."""
+    sample = "the quick brown fox jumps over the lazy dog, 1234567890!\n"
+    text = sample * (size_mb * 1024 * 1024 // len(sample))
+    data = text.encode()
+    # The loop is far too slow for the full input, so it only gets a 1 MB slice
+    loop_text = text[:1024 * 1024]
+
+    def measure(label, func, payload):
+        start = time.perf_counter()
+        func(payload, 3)
+        elapsed = time.perf_counter() - start
+        megabytes = len(payload) / (1024 * 1024)
+        print(f"{label:<18} {megabytes:8.1f} MB {elapsed:9.4f} s {megabytes / elapsed:10.1f} MB/s")
+
+    measure("loop (str)", loop_encrypt, loop_text)
+    measure("translate (str)", encrypt, text)
+    measure("translate (bytes)", encrypt, data)
+
+
+def benchmark_numpy(size_mb=32):
+    """Compares the throughput of the NumPy backend and the table codec (check_parity() verifies them)."""
+    if np is None:
+        print("NumPy is not installed; only the table backend is available")
+        return
+
+    sample = b"The Quick Brown Fox jumps over the lazy dog, 1234567890! ~{}[]\n"
+    data = sample * (size_mb * 1024 * 1024 // len(sample))
+    array = np.frombuffer(data, dtype=np.uint8)
+
+    for label, payload in (("translate (bytes)", data), ("numpy (uint8)", array)):
+        start = time.perf_counter()
+        encrypt(payload, 3)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<18} {size_mb:8.1f} MB {elapsed:9.4f} s {size_mb / elapsed:10.1f} MB/s")
+
+    for label, payload in (("histogram (str)", data.decode()), ("histogram (bytes)", data)):
+        start = time.perf_counter()
+        letter_histogram(payload)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<18} {size_mb:8.1f} MB {elapsed:9.4f} s {size_mb / elapsed:10.1f} MB/s")
+
+
+def benchmark_batch(count=1_000_000):
+    """Compares one encrypt()/decrypt() call per message against a single batch() pass."""
+    messages = ["meet me at the usual place at ten", "the eagle has landed", "abort mission 42"]
+    records = [(messages[i % len(messages)], i % 26, 'encode' if i % 2 else 'decode') for i in range(count)]
+
+    start = time.perf_counter()
+    for text, shift, direction in records:
+        if direction == 'encode':
+            encrypt(text, shift)
         else:
-            cipher_text += letter
-    return cipher_text
+            decrypt(text, shift)
+    per_call = time.perf_counter() - start
 
-def ceasar(original_text, shift_amount):
-    # Determine which function to call based on user's choice
-    if direction == 'encode':
-        cipher = encrypt(original_text=original_text, shift_amount=shift_amount)
-        print(f"Here is the encrypted message: {cipher}")
-    elif direction == 'decode':
-        cipher = decrypt(original_text=original_text, shift_amount=shift_amount)
-        print(f"Here is the decrypted message: {cipher}")
+    start = time.perf_counter()
+    for _ in batch(records):
+        pass
+    batched = time.perf_counter() - start
+
+    print(f"per-call           {count:9d} msgs {per_call:9.4f} s {count / per_call:12.0f} msgs/s")
+    print(f"batch              {count:9d} msgs {batched:9.4f} s {count / batched:12.0f} msgs/s")
+
+
+def benchmark_workers(max_workers, size_mb=256):
+    """Times parallel_transform on a temporary file for 1, 2, 4 ... max_workers processes."""
+    sample = b"the quick brown fox jumps over the lazy dog, 1234567890!\n"
+    counts = []
+    workers = 1
+    while workers < max_workers:
+        counts.append(workers)
+        workers *= 2
+    counts.append(max_workers)
+
+    with tempfile.TemporaryDirectory() as folder:
+        input_path = os.path.join(folder, "input.txt")
+        output_path = os.path.join(folder, "output.txt")
+        with open(input_path, "wb") as source:
+            block = sample * (1024 * 1024 // len(sample))
+            for _ in range(size_mb):
+                source.write(block)
+
+        baseline = None
+        for workers in counts:
+            start = time.perf_counter()
+            parallel_transform(input_path, output_path, 3, 'encode', workers)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"{workers:3d} workers {elapsed:9.4f} s {size_mb / elapsed:10.1f} MB/s {baseline / elapsed:6.2f}x")
+
+
+# --- Interactive Flow ---
+
+def interactive():
+    # Gather user preferences and input data
+    direction = input("Type 'encode' to encrypt, type 'decode' to decrypt, type 'crack' to guess the shift:\n").lower()
+    text = input("Type your message:\n").lower()
+    # Cracking works out the shift by itself, so only ask for it otherwise
+    shift = 0 if direction == 'crack' else int(input("Type the shift number:\n"))
+
+    # Call the main function to execute the logic
+    ceasar(original_text=text, shift_amount=shift, direction=direction)
+
+
+# --- Command Line ---
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Caesar cipher. Run without arguments for the interactive prompts.")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--encode", dest="direction", action="store_const", const="encode",
+                      help="encrypt the input stream")
+    mode.add_argument("--decode", dest="direction", action="store_const", const="decode",
+                      help="decrypt the input stream")
+    mode.add_argument("--crack", dest="direction", action="store_const", const="crack",
+                      help="rank every shift by letter frequency (with --in and --out, write the best decoding)")
+    mode.add_argument("--batch", action="store_true",
+                      help='transform JSONL records {"text", "shift", "direction"} from --in/stdin')
+    mode.add_argument("--benchmark", action="store_true", help="compare the original loop with the table codec")
+    mode.add_argument("--check", action="store_true", help="verify every engine against the original loop")
+    parser.add_argument("--shift", type=int, default=None, help="shift amount for --encode/--decode")
+    parser.add_argument("--in", dest="input_path", help="input file (default: stdin)")
+    parser.add_argument("--out", dest="output_path", help="output file (default: stdout)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="bytes read per chunk when streaming")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="split --in across this many processes (with --benchmark: measure 1..N workers)")
+    args = parser.parse_args(argv)
+
+    if args.direction in ('encode', 'decode') and args.shift is None:
+        parser.error("--shift is required with --encode/--decode")
+    if args.chunk_size <= 0:
+        parser.error("--chunk-size must be positive")
+    if args.direction == 'crack' and args.output_path and not args.input_path:
+        # The decoding is written on a second pass over the input, and stdin can only be read once
+        parser.error("--crack --out needs --in")
+    if args.direction == 'crack' and args.workers is not None:
+        parser.error("--workers is not supported with --crack")
+    if args.workers is not None:
+        if args.workers <= 0:
+            parser.error("--workers must be positive")
+        if args.direction and not (args.input_path and args.output_path):
+            parser.error("--workers needs both --in and --out (memory-mapped files, not pipes)")
+    # Opening --out truncates it, so it must not be the file --in is about to read
+    if args.input_path and args.output_path and os.path.exists(args.input_path) \
+            and os.path.exists(args.output_path) and os.path.samefile(args.input_path, args.output_path):
+        parser.error("--in and --out must be different files")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    if args.check:
+        check_parity()
+    elif args.benchmark:
+        check_parity()
+        benchmark()
+        benchmark_numpy()
+        benchmark_batch()
+        if args.workers:
+            benchmark_workers(args.workers)
+    elif args.batch:
+        run_batch(args)
+    elif args.direction == 'crack':
+        run_crack(args)
+    elif args.direction and args.workers:
+        parallel_transform(args.input_path, args.output_path, args.shift, args.direction,
+                           args.workers, args.chunk_size)
+    elif args.direction:
+        run_stream(args)
     else:
-        # Basic error handling for invalid direction inputs
-        print("Please enter either 'encode' or 'decode':")
+        # No mode given: fall back to the original question-and-answer flow
+        interactive()
+
 
-# Call the main function to execute the logic
-ceasar(original_text=text, shift_amount=shift)
+if __name__ == "__main__":
+    main()
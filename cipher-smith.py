@@ -1,4 +1,14 @@
+import argparse
+import json
+import math
+import os
 import random
+import secrets
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 
 # --- DATA STRUCTURES ---
 # Lists containing all possible characters for the password
@@ -8,43 +18,610 @@ letters = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i', 'j', 'k', 'l', 'm', 'n',
 numbers = ['0', '1', '2', '3', '4', '5', '6', '7', '8', '9']
 symbols = ['!', '#', '$', '%', '&', '(', ')', '*', '+']
 
-print("Welcome to the CipherSmith (PyPassword Generator)!")
+# How many passwords are built from each block of random bytes in bulk mode
+BATCH_SIZE = 10000
+# How many random bytes are read at once for one-at-a-time picks (see EntropyBuffer.randbelow)
+BUFFER_SIZE = 4096
+# How many dead ends a policy password may hit before the policy is treated as unsatisfiable
+MAX_RESTARTS = 1000
 
-# --- USER INPUT ---
-# We cast the inputs to integers (int) so we can use them in math operations
-nr_letters = int(input("How many letters would you like in your password?\n"))
-nr_symbols = int(input(f"How many symbols would you like?\n"))
-nr_numbers = int(input(f"How many numbers would you like?\n"))
 
-# Calculate the total length of the password to determine loop range
-nr_total = nr_letters + nr_symbols + nr_numbers
+# --- BULK RANDOMNESS ---
 
-password = []
+class EntropyBuffer:
+    """
+    Hands out unbiased random picks drawn from large secrets.token_bytes blocks.
+    This is the same OS entropy source secrets.SystemRandom uses, but read once per
+    block instead of once per character.
+    Each random byte is mapped onto a pool with bytes.translate; bytes that would make
+    some characters more likely than others (the 'remainder' of 256 / pool size) are
+    deleted in the same call, which is rejection sampling done entirely in C.
+    """
+    def __init__(self):
+        self._tables = {}
+        self._buffer = b""
+        self._position = 0
 
-# --- PASSWORD GENERATION LOOP ---
-# We loop through the total number of characters needed.
-# Note: This logic builds the password in a specific order (Letter -> Symbol -> Number)
-for num in range(0, nr_total):
+    def _table_for(self, pool):
+        """Builds (once per pool) the byte->character table and the set of rejected bytes."""
+        key = tuple(pool)
+        if key not in self._tables:
+            size = len(pool)
+            if not 0 < size <= 256:
+                raise ValueError("Pools must contain between 1 and 256 items")
+            # Only bytes below 'limit' split evenly across the pool
+            limit = 256 - 256 % size
+            table = bytes(pool[byte % size] if byte < limit else 0 for byte in range(256))
+            rejected = bytes(range(limit, 256))
+            self._tables[key] = (table, rejected, limit)
+        return self._tables[key]
 
-    # Check if user still needs letters, add one, and decrease the count
-    if nr_letters > 0:
-        password += random.choice(letters)
-        nr_letters -= 1
+    def _sample(self, pool, count):
+        """Returns 'count' bytes, each chosen uniformly from 'pool' (a sequence of byte values)."""
+        table, rejected, limit = self._table_for(pool)
+        picks = b""
+        while len(picks) < count:
+            missing = count - len(picks)
+            # Over-draw slightly so one read almost always covers the rejections
+            block = secrets.token_bytes(missing * 256 // limit + 64)
+            picks += block.translate(table, rejected)
+        return picks[:count]
 
-    # Check if user still needs symbols
-    if nr_symbols > 0:
-        password += random.choice(symbols)
-        nr_symbols -= 1
+    def choices(self, pool, count):
+        """Returns a string of 'count' characters picked uniformly from a pool of single characters."""
+        return self._sample("".join(pool).encode(), count).decode()
 
-    # Check if user still needs numbers
-    if nr_numbers > 0:
-        password += random.choice(numbers)
-        nr_numbers -= 1
+    def below(self, bound, count):
+        """Returns 'count' random integers in range(bound) as a bytes object (bound can be at most 256)."""
+        return self._sample(range(bound), count)
 
-random.shuffle(password)
-final_password = ""
-for char in password:
-    final_password += char
+    def randbelow(self, bound):
+        """Returns one random integer in range(bound) (bound can be at most 256) from the buffered bytes."""
+        limit = 256 - 256 % bound
+        while True:
+            if self._position >= len(self._buffer):
+                self._buffer = secrets.token_bytes(BUFFER_SIZE)
+                self._position = 0
+            byte = self._buffer[self._position]
+            self._position += 1
+            if byte < limit:
+                return byte % bound
 
-# --- FINAL OUTPUT ---
-print(f"Your password is: {final_password}")
+
+class PasswordGenerator:
+    """
+    Reusable, cryptographically secure password generator for a fixed letter/symbol/number mix.
+    Characters and shuffle positions are drawn for a whole batch of passwords at once, and the
+    Fisher-Yates shuffle uses unbiased indices, so every arrangement is equally likely.
+    """
+    def __init__(self, nr_letters, nr_symbols, nr_numbers, batch_size=BATCH_SIZE):
+        if min(nr_letters, nr_symbols, nr_numbers) < 0:
+            raise ValueError("Character counts cannot be negative")
+        self.nr_letters = nr_letters
+        self.nr_symbols = nr_symbols
+        self.nr_numbers = nr_numbers
+        self.nr_total = nr_letters + nr_symbols + nr_numbers
+        if self.nr_total > 256:
+            raise ValueError("Passwords can be at most 256 characters long")
+        self.batch_size = batch_size
+        self.entropy = EntropyBuffer()
+        self._ready = []
+
+    @property
+    def entropy_bits(self):
+        """
+        Bits of entropy per password: log2 of how many different passwords can come out.
+        That is every choice of characters within each pool times every way to arrange the classes.
+        """
+        arrangements = math.factorial(self.nr_total) // (math.factorial(self.nr_letters)
+                                                          * math.factorial(self.nr_symbols)
+                                                          * math.factorial(self.nr_numbers))
+        return (self.nr_letters * math.log2(len(letters))
+                + self.nr_symbols * math.log2(len(symbols))
+                + self.nr_numbers * math.log2(len(numbers))
+                + math.log2(arrangements))
+
+    def _batch(self, size):
+        """Builds 'size' passwords from one round of entropy reads."""
+        nr_letters, nr_symbols, nr_numbers = self.nr_letters, self.nr_symbols, self.nr_numbers
+        letter_picks = self.entropy.choices(letters, size * nr_letters)
+        symbol_picks = self.entropy.choices(symbols, size * nr_symbols)
+        number_picks = self.entropy.choices(numbers, size * nr_numbers)
+        # swaps[i][k] is where position i of password k swaps to (Fisher-Yates shuffle)
+        swaps = [b""] + [self.entropy.below(position + 1, size) for position in range(1, self.nr_total)]
+
+        batch = []
+        for k in range(size):
+            password = list(letter_picks[k * nr_letters:(k + 1) * nr_letters]
+                            + symbol_picks[k * nr_symbols:(k + 1) * nr_symbols]
+                            + number_picks[k * nr_numbers:(k + 1) * nr_numbers])
+            for position in range(self.nr_total - 1, 0, -1):
+                other = swaps[position][k]
+                password[position], password[other] = password[other], password[position]
+            batch.append("".join(password))
+        return batch
+
+    def generate(self):
+        """Returns one password, refilling the internal batch when it runs out."""
+        if not self._ready:
+            self._ready = self._batch(self.batch_size)
+            self._ready.reverse()
+        return self._ready.pop()
+
+    def generate_many(self, count):
+        """Yields 'count' passwords, one batch at a time."""
+        remaining = count
+        while remaining > 0:
+            size = min(self.batch_size, remaining)
+            yield from self._batch(size)
+            remaining -= size
+
+
+# --- PASSWORD POLICIES ---
+
+def char_mask(chars):
+    """Bitmap with bit ord(char) set for every character; membership checks become a shift and an AND."""
+    mask = 0
+    for char in chars:
+        mask |= 1 << ord(char)
+    return mask
+
+
+class TrieNode:
+    """One node of the banned-word trie; 'completes' marks characters that would finish a banned word."""
+    def __init__(self):
+        self.children = {}
+        self.completes = 0
+
+
+class PasswordPolicy:
+    """
+    Rules a password must follow: its length, min/max characters per class, banned characters,
+    the longest allowed run of one repeated character and words it must not contain (any case).
+    The character classes are precomputed as bitmaps and the banned words as a trie, so checking
+    whether the next character is allowed never rescans the password.
+    """
+    def __init__(self, length, min_letters=0, max_letters=None, min_symbols=0, max_symbols=None,
+                 min_numbers=0, max_numbers=None, banned_characters="", max_run=None, banned_words=()):
+        self.length = length
+        self.max_run = max_run
+        banned = set(banned_characters)
+        # A one-letter banned word is just a banned character (in either case)
+        for word in banned_words:
+            word = word.strip()
+            if len(word) == 1:
+                banned |= {word.lower(), word.upper()}
+
+        # Each class: its usable characters, their bitmap, and how many it needs / allows
+        # (the minimum is raised below to what the other classes' maximums leave over)
+        self.classes = []
+        for pool, minimum, maximum in ((letters, min_letters, max_letters),
+                                       (symbols, min_symbols, max_symbols),
+                                       (numbers, min_numbers, max_numbers)):
+            chars = [char for char in pool if char not in banned]
+            maximum = length if maximum is None else maximum
+            if not chars:
+                maximum = 0
+            self.classes.append((chars, char_mask(chars), minimum, maximum))
+
+        if length <= 0 or length > 256:
+            raise ValueError("Policy length must be between 1 and 256")
+        if max_run is not None and max_run < 1:
+            raise ValueError("max_run must be at least 1")
+        for chars, mask, minimum, maximum in self.classes:
+            if minimum > maximum:
+                raise ValueError("A class minimum is larger than its maximum (or the class has no usable characters)")
+        if sum(minimum for _, _, minimum, _ in self.classes) > length:
+            raise ValueError("The class minimums add up to more than the password length")
+        if sum(maximum for _, _, _, maximum in self.classes) < length:
+            raise ValueError("The class maximums add up to less than the password length")
+        # Whatever the other classes can't hold has to come from this one, so that is its real minimum
+        total_maximum = sum(maximum for _, _, _, maximum in self.classes)
+        self.classes = [(chars, mask, max(minimum, length - (total_maximum - maximum)), maximum)
+                        for chars, mask, minimum, maximum in self.classes]
+        if max_run is not None:
+            for chars, mask, minimum, maximum in self.classes:
+                # A class with one usable character needs other characters to break up its runs
+                if len(chars) == 1 and minimum > max_run:
+                    runs = -(-minimum // max_run)
+                    if length - minimum < runs - 1:
+                        raise ValueError("A class with one usable character cannot meet its minimum within max_run")
+
+        # Banned words are matched case-insensitively, so letters are stored lowercase
+        self.root = TrieNode()
+        for word in banned_words:
+            word = word.strip().lower()
+            if not word:
+                continue
+            node = self.root
+            for char in word[:-1]:
+                node = node.children.setdefault(char, TrieNode())
+            # Finishing the word with either case of its last letter is not allowed
+            node.completes |= char_mask({word[-1], word[-1].upper()})
+
+    def advance(self, states, char):
+        """Returns the trie nodes matching the end of the password after 'char' is appended."""
+        char = char.lower()
+        return [node.children[char] for node in states + [self.root] if char in node.children]
+
+    def allows(self, password):
+        """Checks a finished password against every rule (used by the rejection baseline and for validation)."""
+        if len(password) != self.length:
+            return False
+        for chars, mask, minimum, maximum in self.classes:
+            used = sum(1 for char in password if (mask >> ord(char)) & 1)
+            if not minimum <= used <= maximum:
+                return False
+        # Every character must belong to one of the (ban-filtered) classes
+        allowed = self.classes[0][1] | self.classes[1][1] | self.classes[2][1]
+        if any(not (allowed >> ord(char)) & 1 for char in password):
+            return False
+        if self.max_run is not None:
+            run = 0
+            for index, char in enumerate(password):
+                run = run + 1 if index and char == password[index - 1] else 1
+                if run > self.max_run:
+                    return False
+        states = []
+        for char in password:
+            forbidden = self.root.completes
+            for node in states:
+                forbidden |= node.completes
+            if (forbidden >> ord(char)) & 1:
+                return False
+            states = self.advance(states, char)
+        return True
+
+
+class PolicyPasswordGenerator:
+    """
+    Builds passwords that satisfy a PasswordPolicy one character at a time.
+    At each position only classes that can still meet every min/max are candidates, and a
+    character is drawn uniformly from them; if it would break a run or finish a banned word
+    (one bitmap test) just that character is drawn again, never the whole password.
+    """
+    def __init__(self, policy):
+        self.policy = policy
+        self.entropy = EntropyBuffer()
+
+    def _span(self, needed, run):
+        """Positions needed to place 'needed' more copies of one character when the password ends in 'run' of them."""
+        max_run = self.policy.max_run
+        if max_run is None or needed <= max_run - run:
+            return needed
+        # Every further block of max_run copies has to be preceded by some other character
+        return needed + -(-(needed - (max_run - run)) // max_run)
+
+    def _open_classes(self, used, remaining, last=None, run=0):
+        """Indexes of the classes that may take the next character without making the policy unreachable."""
+        classes = self.policy.classes
+        needed = [max(0, minimum - count) for (_, _, minimum, _), count in zip(classes, used)]
+        total_needed = sum(needed)
+        open_classes = []
+        for index, (chars, mask, minimum, maximum) in enumerate(classes):
+            if used[index] >= maximum:
+                continue
+            # After this character, the other classes' minimums must still fit in what is left
+            if total_needed - needed[index] <= remaining - 1:
+                open_classes.append(index)
+        # A class with a single usable character can only repeat max_run times in a row,
+        # so keep enough room after this character to break its remaining copies up
+        for index in list(open_classes):
+            for other, (chars, mask, minimum, maximum) in enumerate(classes):
+                if len(chars) != 1 or not needed[other]:
+                    continue
+                if other == index:
+                    span = self._span(needed[other] - 1, run + 1 if last == chars[0] else 1)
+                else:
+                    span = self._span(needed[other], 0)
+                if span > remaining - 1:
+                    open_classes.remove(index)
+                    break
+        return open_classes
+
+    def generate(self):
+        """Returns one password that satisfies the policy."""
+        policy = self.policy
+        classes = policy.classes
+        for _ in range(MAX_RESTARTS):
+            password = []
+            used = [0, 0, 0]
+            states = []
+            run = 0
+            for position in range(policy.length):
+                open_classes = self._open_classes(used, policy.length - position,
+                                                  password[-1] if password else None, run)
+
+                # Characters that would finish a banned word or extend a run too far
+                forbidden = policy.root.completes
+                for node in states:
+                    forbidden |= node.completes
+                if policy.max_run is not None and run >= policy.max_run:
+                    forbidden |= 1 << ord(password[-1])
+
+                candidates = 0
+                for index in open_classes:
+                    candidates |= classes[index][1]
+                if not candidates & ~forbidden:
+                    # Dead end (every candidate is forbidden): very rare, start this password again
+                    break
+
+                size = sum(len(classes[index][0]) for index in open_classes)
+                while True:
+                    pick = self.entropy.randbelow(size)
+                    for index in open_classes:
+                        chars = classes[index][0]
+                        if pick < len(chars):
+                            char = chars[pick]
+                            break
+                        pick -= len(chars)
+                    if not (forbidden >> ord(char)) & 1:
+                        break
+
+                run = run + 1 if password and char == password[-1] else 1
+                password.append(char)
+                used[index] += 1
+                states = policy.advance(states, char)
+            else:
+                return "".join(password)
+        raise ValueError("policy appears unsatisfiable")
+
+    def generate_many(self, count):
+        """Yields 'count' passwords."""
+        for _ in range(count):
+            yield self.generate()
+
+
+def load_policy(path, words_path=None):
+    """Reads a PasswordPolicy from a JSON file of its arguments, plus an optional banned-word list file."""
+    with open(path) as policy_file:
+        options = json.load(policy_file)
+    if words_path:
+        with open(words_path) as words_file:
+            options["banned_words"] = list(options.get("banned_words", [])) + words_file.read().split()
+    return PasswordPolicy(**options)
+
+
+def write_passwords(passwords, destination, batch_size=BATCH_SIZE):
+    """Streams passwords to a text file one batch of lines at a time."""
+    lines = []
+    for password in passwords:
+        lines.append(password)
+        if len(lines) >= batch_size:
+            destination.write("\n".join(lines) + "\n")
+            lines = []
+    if lines:
+        destination.write("\n".join(lines) + "\n")
+    destination.flush()
+
+
+# --- PARALLEL MODE ---
+
+def shard_counts(count, workers):
+    """Splits 'count' as evenly as possible; the first 'count % workers' shards get one extra."""
+    base, extra = divmod(count, workers)
+    return [base + (1 if shard < extra else 0) for shard in range(workers)]
+
+
+def write_shard(path, count, make_generator, options):
+    """
+    Worker job: builds its own generator with make_generator(*options) and writes 'count'
+    passwords into its own file. Each process therefore reads its own OS entropy.
+    """
+    generator = make_generator(*options)
+    with open(path, "w") as destination:
+        write_passwords(generator.generate_many(count), destination)
+    return count
+
+
+def generate_parallel(count, workers, destination, make_generator, *options, shard_dir=None):
+    """
+    Generates passwords across a process pool, one shard file per worker, and appends each
+    shard to 'destination' (in order) as soon as its worker is done. Only file chunks are
+    copied, so memory use stays flat. 'make_generator(*options)' builds the generator each
+    worker uses. The shards live in a temporary folder inside 'shard_dir' (default: the system
+    temp dir, which may be in RAM), so pass a directory on disk for very large runs.
+    """
+    counts = [shard for shard in shard_counts(count, workers) if shard > 0]
+    with tempfile.TemporaryDirectory(dir=shard_dir) as folder:
+        paths = [os.path.join(folder, f"shard-{index}.txt") for index in range(len(counts))]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            jobs = [pool.submit(write_shard, path, shard, make_generator, options)
+                    for path, shard in zip(paths, counts)]
+            for job, path in zip(jobs, paths):
+                # Re-raises any error from a worker
+                job.result()
+                with open(path) as shard_file:
+                    shutil.copyfileobj(shard_file, destination)
+                destination.flush()
+                # Free the disk space now rather than when every shard is done
+                os.remove(path)
+
+
+# --- INTERACTIVE MODE ---
+
+def interactive():
+    print("Welcome to the CipherSmith (PyPassword Generator)!")
+
+    # --- USER INPUT ---
+    # We cast the inputs to integers (int) so we can use them in math operations
+    nr_letters = int(input("How many letters would you like in your password?\n"))
+    nr_symbols = int(input(f"How many symbols would you like?\n"))
+    nr_numbers = int(input(f"How many numbers would you like?\n"))
+
+    # --- PASSWORD GENERATION ---
+    # Only one password is needed, so there is no point drawing a big batch
+    generator = PasswordGenerator(nr_letters, nr_symbols, nr_numbers, batch_size=1)
+    final_password = generator.generate()
+
+    # --- FINAL OUTPUT ---
+    print(f"Your password is: {final_password}")
+    print(f"Strength: {generator.entropy_bits:.1f} bits of entropy")
+
+
+# --- BENCHMARK ---
+
+def legacy_password(nr_letters, nr_symbols, nr_numbers, rng=random):
+    """The original one-character-at-a-time generator, kept as the benchmark baseline."""
+    nr_total = nr_letters + nr_symbols + nr_numbers
+    password = []
+    for num in range(0, nr_total):
+        if nr_letters > 0:
+            password += rng.choice(letters)
+            nr_letters -= 1
+        if nr_symbols > 0:
+            password += rng.choice(symbols)
+            nr_symbols -= 1
+        if nr_numbers > 0:
+            password += rng.choice(numbers)
+            nr_numbers -= 1
+    rng.shuffle(password)
+    final_password = ""
+    for char in password:
+        final_password += char
+    return final_password
+
+
+def benchmark(count=200000, nr_letters=8, nr_symbols=2, nr_numbers=2):
+    """Compares passwords/sec of the original insecure loop, unbuffered SystemRandom and PasswordGenerator."""
+    system_random = secrets.SystemRandom()
+    generator = PasswordGenerator(nr_letters, nr_symbols, nr_numbers)
+
+    def measure(label, produce, amount):
+        start = time.perf_counter()
+        for _ in range(amount):
+            produce()
+        elapsed = time.perf_counter() - start
+        print(f"{label:<28} {amount:8d} passwords {elapsed:8.3f} s {amount / elapsed:12.0f} /s")
+
+    measure("random (insecure, original)", lambda: legacy_password(nr_letters, nr_symbols, nr_numbers), count)
+    # A syscall per character is slow, so this one only gets a tenth of the work
+    measure("SystemRandom (unbuffered)",
+            lambda: legacy_password(nr_letters, nr_symbols, nr_numbers, system_random), count // 10)
+    measure("PasswordGenerator.generate", generator.generate, count)
+
+    start = time.perf_counter()
+    for _ in generator.generate_many(count):
+        pass
+    elapsed = time.perf_counter() - start
+    print(f"{'PasswordGenerator bulk':<28} {count:8d} passwords {elapsed:8.3f} s {count / elapsed:12.0f} /s")
+    print(f"Entropy per password: {generator.entropy_bits:.1f} bits")
+
+
+def benchmark_policy(count=5000):
+    """Compares PolicyPasswordGenerator with naive generate-then-check rejection on a strict policy."""
+    policy = PasswordPolicy(length=12, min_letters=3, max_letters=6, min_symbols=3, min_numbers=3,
+                            banned_characters="lI1O0", max_run=1,
+                            banned_words=["password", "admin", "abc", "123", "qwe", "xyz", "aa", "zz"])
+    generator = PolicyPasswordGenerator(policy)
+    pool = [char for char in letters + symbols + numbers]
+    entropy = EntropyBuffer()
+
+    def naive():
+        # Draw the whole password from the combined pool and start over until it passes
+        while True:
+            password = entropy.choices(pool, policy.length)
+            if policy.allows(password):
+                return password
+
+    for label, produce in (("naive rejection", naive), ("policy generator", generator.generate)):
+        start = time.perf_counter()
+        for _ in range(count):
+            password = produce()
+        elapsed = time.perf_counter() - start
+        assert policy.allows(password)
+        print(f"{label:<28} {count:8d} passwords {elapsed:8.3f} s {count / elapsed:12.0f} /s")
+
+
+def benchmark_workers(max_workers, count=2000000, nr_letters=8, nr_symbols=2, nr_numbers=2):
+    """Times generate_parallel writing to a temporary file for 1, 2, 4 ... max_workers processes."""
+    worker_counts = []
+    workers = 1
+    while workers < max_workers:
+        worker_counts.append(workers)
+        workers *= 2
+    worker_counts.append(max_workers)
+
+    baseline = None
+    with tempfile.TemporaryDirectory() as folder:
+        for workers in worker_counts:
+            with open(os.path.join(folder, "passwords.txt"), "w") as destination:
+                start = time.perf_counter()
+                generate_parallel(count, workers, destination, PasswordGenerator, nr_letters, nr_symbols, nr_numbers,
+                                  shard_dir=folder)
+                elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"{workers:3d} workers {count:9d} passwords {elapsed:8.3f} s "
+                  f"{count / elapsed:12.0f} /s {baseline / elapsed:6.2f}x")
+
+
+# --- COMMAND LINE ---
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="CipherSmith password generator. "
+                                                 "Run without arguments for the interactive prompts.")
+    parser.add_argument("--count", type=int, help="generate this many passwords and stream them out")
+    parser.add_argument("--letters", type=int, default=8, help="letters per password (default: 8)")
+    parser.add_argument("--symbols", type=int, default=2, help="symbols per password (default: 2)")
+    parser.add_argument("--numbers", type=int, default=2, help="numbers per password (default: 2)")
+    parser.add_argument("--out", dest="output_path", help="output file (default: stdout)")
+    parser.add_argument("--policy", dest="policy_path",
+                        help="JSON file of PasswordPolicy rules to use instead of --letters/--symbols/--numbers")
+    parser.add_argument("--banned-words", dest="words_path", help="file of words the passwords must not contain")
+    parser.add_argument("--workers", type=int, help="split --count across this many processes "
+                                                      "(with --benchmark: measure 1..N workers)")
+    parser.add_argument("--tmp-dir", dest="tmp_dir",
+                        help="where --workers keeps its shard files (default: next to --out, else the system temp dir)")
+    parser.add_argument("--benchmark", action="store_true", help="compare generation speed of each method")
+    args = parser.parse_args(argv)
+
+    if args.count is not None and args.count < 0:
+        parser.error("--count cannot be negative")
+    if min(args.letters, args.symbols, args.numbers) < 0:
+        parser.error("--letters, --symbols and --numbers cannot be negative")
+    if args.letters + args.symbols + args.numbers > 256:
+        parser.error("passwords can be at most 256 characters long")
+    if args.words_path and not args.policy_path:
+        parser.error("--banned-words needs --policy")
+    if args.workers is not None and args.workers <= 0:
+        parser.error("--workers must be positive")
+    if args.tmp_dir and not os.path.isdir(args.tmp_dir):
+        parser.error("--tmp-dir must be an existing directory")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    if args.benchmark:
+        benchmark()
+        benchmark_policy()
+        if args.workers:
+            benchmark_workers(args.workers)
+        return
+    if args.count is None:
+        interactive()
+        return
+
+    if args.policy_path:
+        make_generator, options = PolicyPasswordGenerator, (load_policy(args.policy_path, args.words_path),)
+    else:
+        make_generator, options = PasswordGenerator, (args.letters, args.symbols, args.numbers)
+        # Report strength on stderr so it never mixes with the passwords themselves
+        print(f"Generating {args.count} passwords with {PasswordGenerator(*options).entropy_bits:.1f} bits of entropy each",
+              file=sys.stderr)
+
+    destination = open(args.output_path, "w") if args.output_path else sys.stdout
+    try:
+        if args.workers:
+            # Keep the shards on the same disk as the output rather than in a (possibly RAM-backed) /tmp
+            shard_dir = args.tmp_dir or (os.path.dirname(os.path.abspath(args.output_path)) if args.output_path else None)
+            generate_parallel(args.count, args.workers, destination, make_generator, *options, shard_dir=shard_dir)
+        else:
+            write_passwords(make_generator(*options).generate_many(args.count), destination)
+    finally:
+        if args.output_path:
+            destination.close()
+
+
+if __name__ == "__main__":
+    main()
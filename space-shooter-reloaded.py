@@ -1,17 +1,38 @@
+import time
+LAUNCHED = time.perf_counter() # Taken before the other imports so the startup report includes them
+
+import argparse
+import csv
+import gc
+import hashlib
+import json
 import pygame
+import numpy as np
 import random
 import math
+import os
+import statistics
+import struct
+import sys
+import tracemalloc
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from itertools import accumulate, product
+try:
+    import resource # Unix only; rss_kb() falls back to it where /proc isn't available
+except ImportError:
+    resource = None
 
-# --- Configuration & Initialization ---
-pygame.init()
-pygame.mixer.init()
+# --- Configuration ---
 
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
-
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("NEON VOID: Reloaded")
-clock = pygame.time.Clock()
+FPS = 60 # Fixed simulation rate: one Game.step() is always 1/60 s of game time
+MAX_CATCH_UP_STEPS = 5 # Most steps a slow frame may run to catch up before time is dropped
+CULL_MARGIN = 64 # How far past the sides or bottom of the screen an entity may go before it is despawned
+SPAWN_BAND = 240 # How far above the screen enemies and powerups may be (waves are queued up there)
+ASSET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+ASSET_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "neon-void")
 
 # --- Utility Functions ---
 
@@ -31,22 +52,254 @@ def pixel_art_to_surface(pattern, scale, color):
                 pygame.draw.rect(surf, color, (x * scale, y * scale, scale, scale))
     return surf
 
-# Collision Layers (Bitmasking - prepared for advanced collision logic)
+# --- Surface Cache ---
+
+# Every sprite image is built once per key and shared by all instances (sprites never draw on their image)
+surface_cache = {}
+
+def install_surface(key, surf, alpha=True):
+    """
+    Stores a finished surface in the cache. Once a display exists the surface is also converted
+    to the screen's pixel format, which makes every later blit of it cheaper.
+    Opaque surfaces pass alpha=False.
+    """
+    display = pygame.display.get_surface()
+    if display is not None:
+        if alpha:
+            surf = surf.convert_alpha()
+        elif surf.get_flags() & pygame.SRCALPHA or surf.get_masks() != display.get_masks():
+            # Plain new surfaces already match the display; copying a full-screen one costs ms
+            surf = surf.convert()
+    surface_cache[key] = surf
+    return surf
+
+def cached_surface(key, build, alpha=True):
+    """Returns the shared surface for 'key', calling build() only the first time."""
+    surf = surface_cache.get(key)
+    if surf is None:
+        surf = install_surface(key, build(), alpha)
+    return surf
+
+def art_surface(pattern, scale, color):
+    """Cached version of pixel_art_to_surface, keyed on (pattern, scale, color)."""
+    return cached_surface(("art", tuple(pattern), scale, color),
+                          lambda: pixel_art_to_surface(pattern, scale, color))
+
+def bullet_surface():
+    def build():
+        image = pygame.Surface((4, 12), pygame.SRCALPHA)
+        pygame.draw.rect(image, (255, 255, 0), (0, 0, 4, 12))
+        return image
+    return cached_surface(("bullet",), build)
+
+def powerup_surface(color):
+    def build():
+        image = pygame.Surface((16, 16), pygame.SRCALPHA)
+        pygame.draw.circle(image, color, (8, 8), 8)
+        return image
+    return cached_surface(("powerup", color), build)
+
+def star_surface():
+    """A 3x3 star dot, so the starfield is blitted instead of drawn circle by circle."""
+    def build():
+        image = pygame.Surface((3, 3), pygame.SRCALPHA)
+        pygame.draw.circle(image, (200, 200, 200), (1, 1), 1)
+        return image
+    return cached_surface(("star",), build)
+
+def background_surface():
+    """The static backdrop: dark space blue with the "Neon Void" logo already composed in."""
+    def build():
+        image = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        image.fill((5, 5, 30)) # Dark space blue
+        title = art_surface(TITLE_ART, scale=6, color=TITLE_COLOR)
+        image.blit(title, title.get_rect(center=(SCREEN_WIDTH // 2, 250)))
+        return image
+    return cached_surface(("background",), build, alpha=False)
+
+# --- Collision Masks ---
+
+# Surface -> pygame.mask.Mask. Sprites share their surfaces through the cache above, so this
+# holds one mask per sprite kind, built the first time that kind is in a collision.
+mask_cache = {}
+
+def surface_mask(surface):
+    """The pixel mask of a surface, built with pygame.mask.from_surface the first time it is needed."""
+    mask = mask_cache.get(surface)
+    if mask is None:
+        mask = mask_cache[surface] = pygame.mask.from_surface(surface)
+    return mask
+
+def masks_overlap(sprite_a, sprite_b):
+    """Narrowphase test: True if the visible pixels of two sprites touch. Only worth calling once their rects overlap."""
+    rect_a = sprite_a.rect
+    rect_b = sprite_b.rect
+    return surface_mask(sprite_a.image).overlap(surface_mask(sprite_b.image),
+                                                (rect_b.x - rect_a.x, rect_b.y - rect_a.y)) is not None
+
+# Collision Layers (Bitmasking - each CollisionSystem pair is registered with these)
 PLAYER_LAYER = 1 << 0
 ENEMY_LAYER  = 1 << 1
 BULLET_LAYER = 1 << 2
 POWERUP_LAYER = 1 << 3
 
+# --- Broadphase Collision ---
+
+class SpatialHash:
+    """
+    Uniform-grid broadphase. Every sprite is stored in the grid cells its rect touches,
+    so a collision query only looks at sprites sharing a cell instead of the whole group.
+    """
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        # Cells are dicts used as ordered sets, so iteration order never depends on object ids
+        self.cells = {}        # (column, row) -> {sprite: None} for the sprites in that cell
+        self.sprite_cells = {} # sprite -> the cell keys it currently occupies
+
+    def cell_keys(self, rect):
+        """All (column, row) keys covered by a rect."""
+        size = self.cell_size
+        left, top = rect.left // size, rect.top // size
+        right, bottom = (rect.right - 1) // size, (rect.bottom - 1) // size
+        if left == right and top == bottom:
+            # Most sprites are smaller than a cell and sit inside just one
+            return ((left, top),)
+        return tuple((column, row)
+                     for column in range(left, right + 1)
+                     for row in range(top, bottom + 1))
+
+    def insert(self, sprite):
+        keys = self.cell_keys(sprite.rect)
+        self.sprite_cells[sprite] = keys
+        for key in keys:
+            self.cells.setdefault(key, {})[sprite] = None
+
+    def remove(self, sprite):
+        for key in self.sprite_cells.pop(sprite, ()):
+            cell = self.cells[key]
+            del cell[sprite]
+            if not cell:
+                del self.cells[key]
+
+    def sync(self, *groups):
+        """
+        Brings the grid up to date with one or more sprite groups (call once per frame after updates).
+        Only sprites that changed cells are moved, and sprites no longer in any group are dropped.
+        """
+        live = set()
+        for group in groups:
+            for sprite in group:
+                live.add(sprite)
+                old_keys = self.sprite_cells.get(sprite)
+                if old_keys is None:
+                    self.insert(sprite)
+                elif old_keys != self.cell_keys(sprite.rect):
+                    self.remove(sprite)
+                    self.insert(sprite)
+        for sprite in [sprite for sprite in self.sprite_cells if sprite not in live]:
+            self.remove(sprite)
+
+    def collide(self, sprite):
+        """Returns the live sprites in the grid whose rects overlap 'sprite' (like spritecollide)."""
+        rect = sprite.rect
+        keys = self.cell_keys(rect)
+        if len(keys) == 1:
+            candidates = self.cells.get(keys[0], ())
+        else:
+            # A sprite spanning several cells can meet the same neighbour more than once
+            candidates = {}
+            for key in keys:
+                candidates.update(self.cells.get(key, {}))
+        return [other for other in candidates if rect.colliderect(other.rect) and other.alive()]
+
+class CollisionSystem:
+    """
+    Collision matrix driven by the *_LAYER bitmasks. register() declares which two layers
+    interact and which handler to call; process() then walks the broadphase grid once per
+    frame, skips cells whose layers don't interact with each other and only tests sprite
+    pairs whose layers were registered together.
+    With precise=True a pair whose rects overlap must also pass the pixel mask test.
+    """
+    def __init__(self, cell_size=64, precise=True):
+        self.grid = SpatialHash(cell_size)
+        self.precise = precise
+        self.masks = {}     # layer -> bitmask of every layer it interacts with
+        self.handlers = []  # (layer_a, layer_b, handler) in registration order
+
+    def register(self, layer_a, layer_b, handler):
+        """Calls handler(sprite_a, sprite_b) whenever a layer_a sprite overlaps a layer_b sprite."""
+        self.masks[layer_a] = self.masks.get(layer_a, 0) | layer_b
+        self.masks[layer_b] = self.masks.get(layer_b, 0) | layer_a
+        self.handlers.append((layer_a, layer_b, handler))
+
+    def sync(self, *groups):
+        self.grid.sync(*groups)
+
+    def process(self):
+        """Dispatches every overlapping, registered pair once. Sprites killed by a handler are skipped."""
+        sprite_cells = self.grid.sprite_cells
+        tested = set()
+        for cell in self.grid.cells.values():
+            if len(cell) < 2:
+                continue
+            # Split the cell by layer so each registered pair only loops over its own two layers
+            by_layer = {}
+            present = 0
+            for sprite in cell:
+                if sprite.layer in self.masks:
+                    by_layer.setdefault(sprite.layer, []).append(sprite)
+                    present |= sprite.layer
+            # A cell of enemies only (or bullets only) has no pair worth looking at
+            if not any(self.masks[layer] & present for layer in by_layer):
+                continue
+            for layer_a, layer_b, handler in self.handlers:
+                sprites_a = by_layer.get(layer_a)
+                sprites_b = by_layer.get(layer_b)
+                if not sprites_a or not sprites_b:
+                    continue
+                # A layer registered against itself meets each pair once, not as (a, b) and (b, a)
+                same_layer = layer_a == layer_b
+                for index, sprite_a in enumerate(sprites_a):
+                    rect_a = sprite_a.rect
+                    spans_a = len(sprite_cells[sprite_a]) > 1
+                    for sprite_b in sprites_b[index + 1:] if same_layer else sprites_b:
+                        if sprite_a is sprite_b or not rect_a.colliderect(sprite_b.rect):
+                            continue
+                        if spans_a or len(sprite_cells[sprite_b]) > 1:
+                            # A pair sharing several cells must only be handled once (in either order,
+                            # since two cells may list same-layer sprites differently)
+                            pair = (sprite_a, sprite_b) if not same_layer or id(sprite_a) < id(sprite_b) \
+                                else (sprite_b, sprite_a)
+                            if pair in tested:
+                                continue
+                            tested.add(pair)
+                        if self.precise and not masks_overlap(sprite_a, sprite_b):
+                            continue
+                        if sprite_a.alive() and sprite_b.alive():
+                            handler(sprite_a, sprite_b)
+
 # --- Base Classes & Mixins ---
 
 class Entity(pygame.sprite.Sprite):
     """Base class for all moving objects in the game."""
+    # Slots for the attributes touched every frame (Sprite itself still provides a __dict__)
+    __slots__ = ("image", "rect", "_velocity", "pool")
+
     def __init__(self, x, y, image, layer):
         super().__init__()
         self.image = image
         self.rect = self.image.get_rect(center=(x, y))
         self._velocity = 3
         self.layer = layer
+        self.pool = None # Set by EntityPool for recycled instances
+
+    def kill(self):
+        """Removes the entity from all groups and, if it came from a pool, hands it back for reuse."""
+        was_alive = self.alive()
+        super().kill()
+        # Only release once, even if kill() is called again on a dead entity
+        if was_alive and self.pool is not None:
+            self.pool.release(self)
 
     @property
     def velocity(self):
@@ -62,8 +315,38 @@ class HealthMixin:
         self.health -= amount
         return self.health <= 0
 
+class EntityPool:
+    """
+    Fixed-capacity recycler for one Entity class. acquire() hands back a killed instance
+    re-initialised with reset() instead of running Entity.__init__ again, and only constructs
+    a new object when the pool is empty. Killed entities return themselves via release().
+    """
+    def __init__(self, entity_class, capacity):
+        self.entity_class = entity_class
+        self.capacity = capacity
+        self.free = []
+        self.created = 0 # How many instances were actually constructed
+
+    def acquire(self, *args):
+        if self.free:
+            entity = self.free.pop()
+            entity.reset(*args)
+        else:
+            entity = self.entity_class(*args)
+            entity.pool = self
+            self.created += 1
+        return entity
+
+    def release(self, entity):
+        # Beyond capacity, dead entities are simply left to the garbage collector
+        if len(self.free) < self.capacity:
+            self.free.append(entity)
+
 class Particle(pygame.sprite.Sprite):
-    """Simple circular particles for explosion effects."""
+    """
+    Simple circular particles for explosion effects.
+    The game now uses ParticleSystem; this one-sprite-per-particle version is kept as the benchmark baseline.
+    """
     def __init__(self, x, y, color):
         super().__init__()
         self.image = pygame.Surface((4, 4), pygame.SRCALPHA)
@@ -81,6 +364,114 @@ class Particle(pygame.sprite.Sprite):
         if self.life <= 0:
             self.kill()
 
+class ParticleSystem:
+    """
+    Pooled particle engine. Positions, velocities and lifetimes live in preallocated NumPy
+    arrays, a free-list hands out slots, every live particle moves in one vectorised step,
+    and drawing blits one shared cached surface per colour. No per-particle objects are created.
+    """
+    def __init__(self, capacity=4096, radius=2, rng=random):
+        self.capacity = capacity
+        self.radius = radius
+        self.rng = rng
+        self.positions = np.zeros((capacity, 2), dtype=np.float32)
+        self.velocities = np.zeros((capacity, 2), dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.int16)     # frames left; 0 means the slot is free
+        self.color_ids = np.zeros(capacity, dtype=np.uint8)
+        # Stack of free slot indexes (lowest index on top)
+        self.free = list(range(capacity - 1, -1, -1))
+        self.used = 0 # Every slot from here up is free, so updates and draws can stop here
+        self.colors = []   # color_id -> (r, g, b)
+        self.images = []   # color_id -> shared particle surface
+
+    def __len__(self):
+        return self.capacity - len(self.free)
+
+    def color_id(self, color):
+        """Returns the id of a colour, rendering its particle surface the first time it is seen."""
+        if color not in self.colors:
+            size = self.radius * 2
+            # A colour-keyed surface blits much faster than per-pixel alpha for thousands of dots
+            image = pygame.Surface((size, size))
+            pygame.draw.circle(image, color, (self.radius, self.radius), self.radius)
+            image.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+            if pygame.display.get_surface() is not None:
+                image = image.convert()
+            self.colors.append(color)
+            self.images.append(image)
+        return self.colors.index(color)
+
+    def emit(self, x, y, color, count=12):
+        """Starts a burst of particles at (x, y). When the pool is full, extra particles are dropped."""
+        count = min(count, len(self.free))
+        if count == 0:
+            return
+        slots = [self.free.pop() for _ in range(count)]
+        self.used = max(self.used, max(slots) + 1)
+        self.positions[slots] = (x, y)
+        # Random velocity for a 'burst' effect, and a lifetime in frames
+        rng = self.rng
+        self.velocities[slots] = [(rng.uniform(-2, 2), rng.uniform(-2, 2)) for _ in slots]
+        self.life[slots] = [rng.randint(20, 40) for _ in slots]
+        self.color_ids[slots] = self.color_id(color)
+
+    def update(self):
+        """Advances every live particle one frame and returns expired slots to the free-list."""
+        n = self.used
+        if not n:
+            return
+        life = self.life[:n]
+        live = life > 0
+        self.positions[:n][live] += self.velocities[:n][live]
+        life[live] -= 1
+        expired = np.flatnonzero(live & (life == 0))
+        if len(expired):
+            self.free.extend(expired.tolist())
+            if len(self.free) == self.capacity:
+                self.used = 0
+
+    def clear(self):
+        self.life[:] = 0
+        self.free = list(range(self.capacity - 1, -1, -1))
+        self.used = 0
+
+    def draw(self, surface):
+        """Blits every live particle and returns the rects it touched."""
+        live = np.flatnonzero(self.life[:self.used] > 0)
+        if not len(live):
+            return []
+        images = self.images
+        corners = (self.positions[live] - self.radius).astype(np.int32).tolist()
+        return surface.blits([(images[color_id], corner)
+                              for color_id, corner in zip(self.color_ids[live].tolist(), corners)])
+
+class Starfield:
+    """
+    The scrolling background stars as NumPy x and y arrays. Every star moves and wraps in
+    a single vectorised step, and drawing is one blits() call of a shared dot surface.
+    """
+    def __init__(self, count=50, speed=1.5, rng=random):
+        self.speed = speed
+        positions = [(rng.randint(0, SCREEN_WIDTH), rng.randint(0, SCREEN_HEIGHT)) for _ in range(count)]
+        self.xs = np.array([x for x, _ in positions], dtype=np.float32)
+        self.ys = np.array([y for _, y in positions], dtype=np.float32)
+
+    def __len__(self):
+        return len(self.ys)
+
+    def update(self):
+        ys = self.ys
+        ys += self.speed
+        # Stars wrap around screen (a masked subtract is much cheaper than a float modulo)
+        ys[ys >= SCREEN_HEIGHT] -= SCREEN_HEIGHT
+
+    def draw(self, surface):
+        """Blits every star (centred on its position) and returns the rects it touched."""
+        star = star_surface()
+        xs = (self.xs - 1).astype(np.int32).tolist()
+        ys = (self.ys - 1).astype(np.int32).tolist()
+        return surface.blits([(star, corner) for corner in zip(xs, ys)])
+
 # --- Game Entities ---
 
 PLAYER_SHIP_ART = [
@@ -93,9 +484,13 @@ PLAYER_SHIP_ART = [
     "X.......X",
 ]
 
+PLAYER_COLOR = (0, 200, 255)
+
 class Player(Entity, HealthMixin):
+    __slots__ = ("health", "cooldown", "weapon_mode", "weapon_timer")
+
     def __init__(self):
-        image = pixel_art_to_surface(PLAYER_SHIP_ART, scale=4, color=(0, 200, 255))
+        image = art_surface(PLAYER_SHIP_ART, scale=4, color=PLAYER_COLOR)
         super().__init__(SCREEN_WIDTH // 2, 520, image, PLAYER_LAYER)
         HealthMixin.__init__(self, 100)
         self.cooldown = 0
@@ -121,53 +516,72 @@ class Player(Entity, HealthMixin):
                 self.weapon_mode = "laser" # Revert to default
 
 class Bullet(Entity):
+    __slots__ = ("dx", "dy")
+
     def __init__(self, x, y, dx=0, dy=-8):
-        image = pygame.Surface((4, 12), pygame.SRCALPHA)
-        pygame.draw.rect(image, (255, 255, 0), (0, 0, 4, 12))
-        super().__init__(x, y, image, BULLET_LAYER)
+        super().__init__(x, y, bullet_surface(), BULLET_LAYER)
+        self.dx = dx
+        self.dy = dy
+
+    def reset(self, x, y, dx=0, dy=-8):
+        """Re-initialises a pooled bullet."""
+        self.rect.center = (x, y)
         self.dx = dx
         self.dy = dy
 
     def update(self):
         self.rect.x += self.dx
         self.rect.y += self.dy
-        if self.rect.bottom < 0:
-            self.kill()
 
 class PowerUp(Entity):
+    __slots__ = ("kind", "speed")
+
     def __init__(self, x, y, kind):
         color = (0, 255, 0) if kind == "heal" else (255, 165, 0)
-        image = pygame.Surface((16, 16), pygame.SRCALPHA)
-        pygame.draw.circle(image, color, (8, 8), 8)
-        super().__init__(x, y, image, POWERUP_LAYER)
+        super().__init__(x, y, powerup_surface(color), POWERUP_LAYER)
         self.kind = kind
         self.speed = 1
 
+    def reset(self, x, y, kind):
+        """Re-initialises a pooled powerup."""
+        color = (0, 255, 0) if kind == "heal" else (255, 165, 0)
+        self.image = powerup_surface(color)
+        self.rect.center = (x, y)
+        self.kind = kind
+
     def update(self):
         self.rect.y += self.speed
-        if self.rect.top > SCREEN_HEIGHT:
-            self.kill()
 
 # --- Enemy Definitions ---
 
 ENEMY_SHIP_ART = ["..X...X..","...XXX...",".XX.X.XX.","X.XXXXX.X","X.XXXXX.X",".XXXXXXX.","..X...X.."]
 TANK_SHIP_ART = ["XXXXXXXXX","XXXXXXXXX","X.XXXXX.X","X..XXX..X","X...X...X",".X.....X.","..X...X.."]
 
+# Stats for each enemy variety: art, color, speed, health
+ENEMY_TYPES = {
+    "standard": (ENEMY_SHIP_ART, (255, 60, 60), 1.2, 30),
+    "zigzag": (ENEMY_SHIP_ART, (255, 100, 100), 1, 30),
+    "tank": (TANK_SHIP_ART, (255, 140, 0), 0.6, 60),
+}
+
 class Enemy(Entity, HealthMixin):
+    __slots__ = ("health", "speed", "angle", "type", "motion", "slot")
+
     def __init__(self, x, y, enemy_type="standard"):
-        # Setup stats based on enemy variety
-        if enemy_type == "standard":
-            art, color, self.speed, health = ENEMY_SHIP_ART, (255, 60, 60), 1.2, 30
-        elif enemy_type == "zigzag":
-            art, color, self.speed, health = ENEMY_SHIP_ART, (255, 100, 100), 1, 30
-            self.angle = 0 # Used for math.sin movement
-        elif enemy_type == "tank":
-            art, color, self.speed, health = TANK_SHIP_ART, (255, 140, 0), 0.6, 60
-
-        image = pixel_art_to_surface(art, scale=3, color=color)
-        super().__init__(x, y, image, ENEMY_LAYER)
+        art, color, _, _ = ENEMY_TYPES[enemy_type]
+        super().__init__(x, y, art_surface(art, scale=3, color=color), ENEMY_LAYER)
+        self.motion = None # The EnemyMotion moving this enemy, if any (otherwise update() does)
+        self.slot = 0
+        self.reset(x, y, enemy_type)
+
+    def reset(self, x, y, enemy_type="standard"):
+        """Sets up stats based on enemy variety (also re-initialises a pooled enemy)."""
+        art, color, self.speed, health = ENEMY_TYPES[enemy_type]
+        self.image = art_surface(art, scale=3, color=color)
+        self.rect = self.image.get_rect(center=(x, y))
         HealthMixin.__init__(self, health)
         self.type = enemy_type
+        self.angle = 0 # Used for math.sin movement (zigzag only)
 
     def update(self):
         self.rect.y += self.speed
@@ -175,67 +589,626 @@ class Enemy(Entity, HealthMixin):
             # Horizontal movement based on a Sine wave
             self.rect.x += int(3 * math.sin(self.angle))
             self.angle += 0.1
-        if self.rect.top > SCREEN_HEIGHT:
-            self.kill()
+
+    def kill(self):
+        if self.motion is not None:
+            self.motion.remove(self)
+        super().kill()
+
+class EnemyMotion:
+    """
+    Struct-of-arrays movement for every enemy in a game. Positions, speeds and zigzag phases
+    live in NumPy arrays packed densely (a removed enemy's slot is filled by the last one), so
+    one vectorised step moves them all, then the results are written back to the rects.
+    """
+    ZIGZAG_AMPLITUDE = 3 # pixels of sideways movement per frame at the peak of the sine wave
+    ZIGZAG_STEP = 0.1    # radians the zigzag phase advances per frame
+
+    ARRAYS = ("xs", "ys", "speeds", "angles", "amplitudes", "angle_steps")
+
+    def __init__(self, capacity=128):
+        self.count = 0
+        self.enemies = []
+        self.xs = np.zeros(capacity) # rect centres
+        self.ys = np.zeros(capacity)
+        self.speeds = np.zeros(capacity)
+        self.angles = np.zeros(capacity)
+        self.amplitudes = np.zeros(capacity) # 0 for enemies that fly straight down
+        self.angle_steps = np.zeros(capacity)
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self):
+        for name in self.ARRAYS:
+            setattr(self, name, np.resize(getattr(self, name), len(self.speeds) * 2))
+
+    def add(self, enemy):
+        if self.count == len(self.speeds):
+            self._grow()
+        slot = self.count
+        self.count += 1
+        self.enemies.append(enemy)
+        enemy.motion = self
+        enemy.slot = slot
+        self.xs[slot], self.ys[slot] = enemy.rect.center
+        self.speeds[slot] = enemy.speed
+        self.angles[slot] = enemy.angle
+        zigzag = enemy.type == "zigzag"
+        self.amplitudes[slot] = self.ZIGZAG_AMPLITUDE if zigzag else 0
+        self.angle_steps[slot] = self.ZIGZAG_STEP if zigzag else 0
+
+    def remove(self, enemy):
+        """Drops an enemy, moving the last one into its slot so the arrays stay contiguous."""
+        slot = enemy.slot
+        last = self.count - 1
+        if slot != last:
+            moved = self.enemies[last]
+            self.enemies[slot] = moved
+            moved.slot = slot
+            for name in self.ARRAYS:
+                array = getattr(self, name)
+                array[slot] = array[last]
+        self.enemies.pop()
+        self.count = last
+        enemy.motion = None
+
+    def update(self):
+        """Moves every enemy one frame and syncs their rects."""
+        n = self.count
+        if not n:
+            return
+        xs = self.xs[:n]
+        ys = self.ys[:n]
+        angles = self.angles[:n]
+        ys += self.speeds[:n]
+        # Horizontal movement based on a Sine wave (zero amplitude for non-zigzag enemies)
+        xs += self.amplitudes[:n] * np.sin(angles)
+        angles += self.angle_steps[:n]
+
+        for enemy, x, y in zip(self.enemies, xs.tolist(), ys.tolist()):
+            enemy.rect.center = (x, y)
+
+# --- World Bounds ---
+
+class WorldBounds:
+    """
+    The one place entities are despawned for leaving the play area: anything entirely outside
+    the screen plus 'margin' on the sides and bottom is killed. The top edge depends on the
+    direction of travel. Bullets fly up and can never come back, so they go as soon as they
+    leave the top. Enemies and powerups enter from above, so they may wait up to 'spawn_band'
+    pixels above the screen.
+    """
+    def __init__(self, margin=CULL_MARGIN, spawn_band=SPAWN_BAND):
+        self.margin = margin
+        width = SCREEN_WIDTH + 2 * margin
+        self.outgoing = pygame.Rect(-margin, 0, width, SCREEN_HEIGHT + margin)
+        self.incoming = pygame.Rect(-margin, -spawn_band, width, SCREEN_HEIGHT + margin + spawn_band)
+
+    def cull(self, group, area):
+        """Kills every sprite in 'group' that doesn't overlap 'area' and returns how many there were."""
+        gone = [sprite for sprite in group if not area.colliderect(sprite.rect)]
+        for sprite in gone:
+            sprite.kill()
+        return len(gone)
 
 # --- Wave & Spawning System ---
 
+FORMATIONS = ("line", "v", "swoop")
+# Weighted odds for enemy variety in generated waves (also kept cumulative, for rng.choices())
+ENEMY_KINDS = ("standard", "zigzag", "tank")
+ENEMY_WEIGHTS = (5, 3, 2)
+ENEMY_CUM_WEIGHTS = tuple(accumulate(ENEMY_WEIGHTS))
+SPAWN_DELAY = 45 # Default frames between individual enemy spawns
+
+# (formation_type, count, spacing) -> tuple of (dx, dy) offsets
+formation_cache = {}
+
+def formation_offsets(formation_type, count, spacing=80):
+    """
+    The layout of a formation as (dx, dy) offsets from its centre and start row. It depends only
+    on its arguments, so the trig for each (formation, count, spacing) is done once and cached.
+    """
+    key = (formation_type, count, spacing)
+    offsets = formation_cache.get(key)
+    if offsets is None:
+        offsets = []
+        if formation_type == "line":
+            for i in range(count):
+                offsets.append(((i - count // 2) * spacing, 0))
+        elif formation_type == "v":
+            for i in range(count):
+                offset = i - count // 2
+                offsets.append((offset * spacing, abs(offset) * 40))
+        elif formation_type == "swoop":
+            for i in range(count):
+                angle = i * (math.pi / (count - 1 if count > 1 else 1))
+                offsets.append((int(240 * math.cos(angle)), int(140 * math.sin(angle))))
+        offsets = formation_cache[key] = tuple(offsets)
+    return offsets
+
 def formation_positions(center_x, start_y, formation_type, count, spacing=80):
     """Calculates coordinate points for different enemy spawn patterns."""
-    positions = []
-    if formation_type == "line":
-        for i in range(count):
-            x = center_x + (i - count // 2) * spacing
-            y = start_y
-            positions.append((x, y))
-    elif formation_type == "v":
-        for i in range(count):
-            offset = i - count // 2
-            x = center_x + offset * spacing
-            y = start_y + abs(offset) * 40
-            positions.append((x, y))
-    elif formation_type == "swoop":
-        for i in range(count):
-            angle = i * (math.pi / (count - 1 if count > 1 else 1))
-            x = center_x + int(240 * math.cos(angle))
-            y = start_y + int(140 * math.sin(angle))
-            positions.append((x, y))
-    return positions
-
-def prepare_wave():
-    """Generates the data for the next wave of enemies."""
-    global current_wave_enemies, spawn_index
-    formation_type = random.choice(["line", "v", "swoop"])
+    return [(center_x + dx, start_y + dy) for dx, dy in formation_offsets(formation_type, count, spacing)]
+
+def prepare_wave(wave_number, rng=random, spawn_delay=SPAWN_DELAY, cum_weights=ENEMY_CUM_WEIGHTS):
+    """
+    Generates the script for a wave of enemies: a list of (delay, x, y, enemy_type) spawns,
+    where delay is the number of frames to wait after the previous spawn.
+    """
+    formation_type = rng.choice(FORMATIONS)
     count = 6 + wave_number * 2
-    positions = formation_positions(400, -120, formation_type, count)
+    # Weighted choice for enemy variety, drawn for the whole wave in one call
+    enemy_types = rng.choices(ENEMY_KINDS, cum_weights=cum_weights, k=count)
+    return [(spawn_delay, x, y, enemy_type)
+            for (x, y), enemy_type in zip(formation_positions(400, -120, formation_type, count), enemy_types)]
+
+def scripted_wave(spec, rng=random, spawn_delay=SPAWN_DELAY, cum_weights=ENEMY_CUM_WEIGHTS):
+    """
+    Builds the script of one wave from a wave file entry: either a formation
+    ({"formation": "v", "count": 8, optional "types", "center_x", "start_y", "spacing", "delay"};
+    "types" is cycled through, and without it types are drawn like generated waves) or explicit
+    spawns ({"spawns": [[x, y, type], [x, y, type, delay], ...]}).
+    """
+    if "spawns" in spec:
+        return [(spawn[3] if len(spawn) > 3 else spawn_delay, spawn[0], spawn[1], spawn[2])
+                for spawn in spec["spawns"]]
+    count = spec["count"]
+    types = spec.get("types") or rng.choices(ENEMY_KINDS, cum_weights=cum_weights, k=count)
+    delay = spec.get("delay", spawn_delay)
+    positions = formation_positions(spec.get("center_x", 400), spec.get("start_y", -120),
+                                    spec["formation"], count, spec.get("spacing", 80))
+    return [(delay, x, y, types[i % len(types)]) for i, (x, y) in enumerate(positions)]
+
+def load_waves(path):
+    """
+    Reads a JSON wave file: {"spawn_delay": 45, "waves": [wave, ...]} (see scripted_wave for
+    the wave entries). Raises ValueError for anything the game couldn't spawn.
+    """
+    with open(path) as wave_file:
+        try:
+            data = json.load(wave_file)
+        except json.JSONDecodeError as error:
+            raise ValueError(f"{path}: not valid JSON ({error})") from error
+
+    def is_int(value):
+        return isinstance(value, int) and not isinstance(value, bool)
+
+    def is_number(value):
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected a JSON object with a \"waves\" list")
+    waves = data.get("waves")
+    if not isinstance(waves, list) or not waves:
+        raise ValueError(f"{path}: expected a non-empty \"waves\" list")
+    if not is_int(data.get("spawn_delay", SPAWN_DELAY)) or data.get("spawn_delay", SPAWN_DELAY) < 0:
+        raise ValueError(f"{path}: \"spawn_delay\" must be a non-negative whole number of frames")
+    # An enemy entirely outside this area would be culled the frame it appears
+    area = WorldBounds().incoming
+    for number, spec in enumerate(waves, 1):
+        where = f"{path}: wave {number}"
+        if not isinstance(spec, dict):
+            raise ValueError(f"{where} must be an object")
+        if "spawns" in spec:
+            spawns = spec["spawns"]
+            if not isinstance(spawns, list) or not spawns:
+                raise ValueError(f"{where}: \"spawns\" must be a non-empty list")
+            for spawn in spawns:
+                if (not isinstance(spawn, list) or len(spawn) not in (3, 4)
+                        or not is_number(spawn[0]) or not is_number(spawn[1]) or not isinstance(spawn[2], str)
+                        or (len(spawn) == 4 and (not is_int(spawn[3]) or spawn[3] < 0))):
+                    raise ValueError(f"{where}: each spawn must be [x, y, type] or [x, y, type, delay], "
+                                     f"not {spawn!r}")
+            kinds = [spawn[2] for spawn in spawns]
+            placed = [(spawn[0], spawn[1], (spawn[2],)) for spawn in spawns]
+        elif spec.get("formation") in FORMATIONS and is_int(spec.get("count")) and spec["count"] > 0:
+            for key in ("delay", "spacing"):
+                if key in spec and (not is_int(spec[key]) or spec[key] < 0):
+                    raise ValueError(f"{where}: \"{key}\" must be a non-negative whole number")
+            for key in ("center_x", "start_y"):
+                if key in spec and not is_number(spec[key]):
+                    raise ValueError(f"{where}: \"{key}\" must be a number")
+            kinds = spec.get("types") or []
+            if not isinstance(kinds, list):
+                raise ValueError(f"{where}: \"types\" must be a list of enemy types")
+            points = formation_positions(spec.get("center_x", 400), spec.get("start_y", -120),
+                                         spec["formation"], spec["count"], spec.get("spacing", 80))
+            # Without "types" any kind may be drawn for a position, so each has to fit
+            placed = [(x, y, (kinds[i % len(kinds)],) if kinds else ENEMY_KINDS) for i, (x, y) in enumerate(points)]
+        else:
+            raise ValueError(f"{where} needs \"spawns\" or a formation "
+                             f"({', '.join(FORMATIONS)}) with a positive whole \"count\"")
+        for kind in kinds:
+            if not isinstance(kind, str) or kind not in ENEMY_TYPES:
+                raise ValueError(f"{where} has unknown enemy type {kind!r}")
+        for x, y, candidates in placed:
+            for kind in candidates:
+                art = ENEMY_TYPES[kind][0]
+                rect = pygame.Rect(0, 0, len(art[0]) * 3, len(art) * 3) # The size Enemy draws it at
+                rect.center = (x, y)
+                if not area.colliderect(rect):
+                    raise ValueError(f"{where} spawns an enemy at ({x}, {y}), where it would be culled at once "
+                                     f"(the play area spans x {area.left}..{area.right - 1}, "
+                                     f"y {area.top}..{area.bottom - 1})")
+    return data
+
+class WaveScheduler:
+    """
+    Supplies wave scripts in order: the waves from a wave file first (if any), then generated
+    waves forever. Scripts come from a generator, and prefetch() builds the next one on a
+    quiet frame while the current wave is still playing, so starting a wave only swaps lists.
+    Waves use their own RNG, so their content doesn't depend on when they were prefetched.
+    """
+    def __init__(self, rng=random, wave_file=None, cum_weights=ENEMY_CUM_WEIGHTS):
+        self.rng = rng
+        self.cum_weights = cum_weights
+        self.wave_file = wave_file or {"waves": []}
+        self.spawn_delay = self.wave_file.get("spawn_delay", SPAWN_DELAY)
+        self.scripts = self.generate()
+        self.upcoming = None
+
+    def generate(self):
+        for spec in self.wave_file["waves"]:
+            yield scripted_wave(spec, self.rng, self.spawn_delay, self.cum_weights)
+        wave_number = len(self.wave_file["waves"])
+        while True:
+            wave_number += 1
+            yield prepare_wave(wave_number, self.rng, self.spawn_delay, self.cum_weights)
+
+    def prefetch(self):
+        """Builds the next wave's script now, unless it is ready already."""
+        if self.upcoming is None:
+            self.upcoming = next(self.scripts)
+
+    def next_wave(self):
+        self.prefetch()
+        script, self.upcoming = self.upcoming, None
+        return script
+
+def preload_surfaces():
+    """Builds every sprite surface up front so the first spawn of each kind doesn't stall a frame."""
+    for enemy_type in ("standard", "zigzag", "tank"):
+        Enemy(0, 0, enemy_type)
+    for kind in ("heal", "weapon"):
+        PowerUp(0, 0, kind)
+    Bullet(0, 0)
+    star_surface()
+    background_surface()
+
+# --- Stress Benchmark ---
+
+def benchmark_collisions(sizes=(25, 50, 100, 200, 400, 800), frames=60):
+    """
+    Prints the average collision-phase time per frame for the original nested spritecollide
+    scan and for the SpatialHash broadphase, with equal numbers of enemies and bullets.
+    """
+    print(f"{'entities':>8} {'nested ms':>10} {'grid ms':>10} {'matrix ms':>10} {'speedup':>8}")
+    for count in sizes:
+        rng = random.Random(count)
+        enemy_group = pygame.sprite.Group(
+            Enemy(rng.randint(0, SCREEN_WIDTH), rng.randint(0, SCREEN_HEIGHT), rng.choice(["standard", "tank"]))
+            for _ in range(count))
+        bullet_group = pygame.sprite.Group(
+            Bullet(rng.randint(0, SCREEN_WIDTH), rng.randint(0, SCREEN_HEIGHT)) for _ in range(count))
+        grid = SpatialHash()
+
+        start = time.perf_counter()
+        for _ in range(frames):
+            for bullet in bullet_group:
+                pygame.sprite.spritecollide(bullet, enemy_group, False)
+        nested = (time.perf_counter() - start) / frames
+
+        start = time.perf_counter()
+        for _ in range(frames):
+            # Nudge every enemy so the incremental sync has real work to do
+            for enemy in enemy_group:
+                enemy.rect.y = (enemy.rect.y + 1) % SCREEN_HEIGHT
+            grid.sync(enemy_group)
+            for bullet in bullet_group:
+                grid.collide(bullet)
+        hashed = (time.perf_counter() - start) / frames
+
+        # Full collision matrix: bullets, enemies and powerups in one grid, one pass
+        powerup_group = pygame.sprite.Group(
+            PowerUp(rng.randint(0, SCREEN_WIDTH), rng.randint(0, SCREEN_HEIGHT), "heal") for _ in range(count // 10))
+        system = CollisionSystem()
+        system.register(BULLET_LAYER, ENEMY_LAYER, lambda bullet, enemy: None)
+        system.register(PLAYER_LAYER, ENEMY_LAYER, lambda player, enemy: None)
+        system.register(PLAYER_LAYER, POWERUP_LAYER, lambda player, powerup: None)
+        start = time.perf_counter()
+        for _ in range(frames):
+            for enemy in enemy_group:
+                enemy.rect.y = (enemy.rect.y + 1) % SCREEN_HEIGHT
+            system.sync(bullet_group, enemy_group, powerup_group)
+            system.process()
+        matrix = (time.perf_counter() - start) / frames
+
+        print(f"{count * 2:8d} {nested * 1000:10.3f} {hashed * 1000:10.3f} {matrix * 1000:10.3f} "
+              f"{nested / hashed:7.1f}x")
+
+def benchmark_narrowphase(sizes=(16, 32, 64, 200, 400, 800), frames=60):
+    """
+    Prints the collision-phase time per frame with rect-only hits and with the pixel mask
+    narrowphase, and how many rect hits the masks rejected. Enemies, bullets and powerups
+    are packed into the top half of the screen so plenty of rects overlap.
+    """
+    print(f"{'entities':>8} {'rect us':>9} {'masks us':>9} {'added us':>9} {'rect hits':>10} {'pixel hits':>11}")
+    for count in sizes:
+        rng = random.Random(count)
+        enemy_group = pygame.sprite.Group(
+            Enemy(rng.randint(0, SCREEN_WIDTH), rng.randint(0, SCREEN_HEIGHT // 2), rng.choice(ENEMY_KINDS))
+            for _ in range(count))
+        bullet_group = pygame.sprite.Group(
+            Bullet(rng.randint(0, SCREEN_WIDTH), rng.randint(0, SCREEN_HEIGHT // 2)) for _ in range(count))
+        powerup_group = pygame.sprite.Group(
+            PowerUp(rng.randint(0, SCREEN_WIDTH), rng.randint(0, SCREEN_HEIGHT // 2), rng.choice(["heal", "weapon"]))
+            for _ in range(max(1, count // 10)))
+        player_group = pygame.sprite.GroupSingle(Player())
+        player_group.sprite.rect.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 4)
+
+        results = {}
+        for precise in (False, True):
+            hits = [0]
+            def count_hit(sprite_a, sprite_b):
+                hits[0] += 1
+            system = CollisionSystem(precise=precise)
+            system.register(BULLET_LAYER, ENEMY_LAYER, count_hit)
+            system.register(PLAYER_LAYER, ENEMY_LAYER, count_hit)
+            system.register(PLAYER_LAYER, POWERUP_LAYER, count_hit)
+            system.sync(player_group, bullet_group, enemy_group, powerup_group)
+            start = time.perf_counter()
+            for _ in range(frames):
+                system.process()
+            results[precise] = ((time.perf_counter() - start) / frames, hits[0] // frames)
+
+        (rect_time, rect_hits), (mask_time, pixel_hits) = results[False], results[True]
+        print(f"{count * 2 + count // 10 + 1:8d} {rect_time * 1e6:9.1f} {mask_time * 1e6:9.1f} "
+              f"{(mask_time - rect_time) * 1e6:9.1f} {rect_hits:10d} {pixel_hits:11d}")
+
+def benchmark_spawning(wave=30, shots=100, drops=30):
+    """
+    Prints the average cost of each spawn during a heavy wave, first rebuilding every
+    surface per spawn (the old behaviour) and then with the shared surface cache.
+    """
+    rng = random.Random(wave)
+    enemy_types = rng.choices(["standard", "zigzag", "tank"], weights=[5, 3, 2], k=6 + wave * 2)
+    spawns = [("enemy", lambda kind=kind: Enemy(400, -120, kind)) for kind in enemy_types]
+    spawns += [("bullet", lambda: Bullet(400, 500, 2, -5))] * (shots * 3)
+    spawns += [("powerup", lambda kind=kind: PowerUp(400, 300, kind))
+               for kind in rng.choices(["heal", "weapon"], k=drops)]
+
+    print(f"{'spawn':>8} {'count':>6} {'uncached us':>12} {'cached us':>10}")
+    results = {}
+    for cached in (False, True):
+        surface_cache.clear()
+        totals = {}
+        for kind, spawn in spawns:
+            if not cached:
+                surface_cache.clear()
+            start = time.perf_counter()
+            spawn()
+            totals[kind] = totals.get(kind, 0) + time.perf_counter() - start
+        results[cached] = totals
+
+    for kind in ("enemy", "bullet", "powerup"):
+        count = sum(1 for spawn_kind, _ in spawns if spawn_kind == kind)
+        print(f"{kind:>8} {count:6d} {results[False][kind] / count * 1e6:12.1f} "
+              f"{results[True][kind] / count * 1e6:10.1f}")
 
-    current_wave_enemies = []
-    for pos in positions:
-        # Weighted choice for enemy variety
-        enemy_type = random.choices(["standard", "zigzag", "tank"], weights=[5, 3, 2])[0]
-        current_wave_enemies.append((pos[0], pos[1], enemy_type))
-    
-    spawn_index = 0
+def benchmark_pooling(frames=36000):
+    """
+    Replays the same scripted 10-minute (36000 frame) spawn pattern with plain constructors
+    and with EntityPools, reporting instances constructed, garbage collections and frame-time jitter.
+    A second, untimed run of each mode under tracemalloc measures how many bytes a frame allocates
+    on top of what is already live (the short-lived garbage pooling is meant to avoid).
+    """
+    def session(make_bullet, make_enemy, make_powerup, trace=False):
+        rng = random.Random(15)
+        groups = [pygame.sprite.Group() for _ in range(3)]
+        bullet_group, enemy_group, powerup_group = groups
+        bounds = WorldBounds()
+        collections = sum(stat["collections"] for stat in gc.get_stats())
+        frame_times = []
+        churn = 0
+        for frame in range(frames):
+            if trace:
+                tracemalloc.reset_peak()
+                live = tracemalloc.get_traced_memory()[0]
+            start = time.perf_counter_ns()
+            if frame % 15 == 0:
+                # A spread shot every time the weapon cools down
+                for dx in (-2, 0, 2):
+                    bullet_group.add(make_bullet(400 + dx * 8, 520, dx, -5))
+            if frame % 45 == 0:
+                enemy_group.add(make_enemy(rng.randint(50, 750), -20, rng.choice(["standard", "zigzag", "tank"])))
+            if frame % 90 == 0:
+                powerup_group.add(make_powerup(rng.randint(50, 750), 100, rng.choice(["heal", "weapon"])))
+            for group in groups:
+                group.update()
+            bounds.cull(bullet_group, bounds.outgoing)
+            # Enemies shot down mid-screen (and powerups collected) die before leaving it
+            for enemy in enemy_group:
+                if enemy.rect.top > 300:
+                    enemy.kill()
+            for powerup in powerup_group:
+                if powerup.rect.top > 400:
+                    powerup.kill()
+            frame_times.append(time.perf_counter_ns() - start)
+            if trace:
+                churn += tracemalloc.get_traced_memory()[1] - live
+        collections = sum(stat["collections"] for stat in gc.get_stats()) - collections
+        return frame_times, collections, churn / frames
+
+    def traced(*makers):
+        tracemalloc.start()
+        try:
+            return session(*makers, trace=True)[2]
+        finally:
+            tracemalloc.stop()
+
+    spawned = (frames // 15) * 3 + frames // 45 + frames // 90
+    plain_times, plain_collections, _ = session(Bullet, Enemy, PowerUp)
+    plain_churn = traced(Bullet, Enemy, PowerUp)
+    pools = [EntityPool(Bullet, 256), EntityPool(Enemy, 128), EntityPool(PowerUp, 32)]
+    pooled_times, pooled_collections, _ = session(*(pool.acquire for pool in pools))
+    created = sum(pool.created for pool in pools)
+    pooled_churn = traced(*(pool.acquire for pool in pools))
+
+    print(f"{'mode':>8} {'objects':>8} {'gc runs':>8} {'B/frame':>8} {'mean us':>8} {'stdev us':>9} "
+          f"{'p99 us':>8} {'max us':>8}")
+    for label, times, objects, collections, churn in (
+            ("plain", plain_times, spawned, plain_collections, plain_churn),
+            ("pooled", pooled_times, created, pooled_collections, pooled_churn)):
+        ordered = sorted(times)
+        print(f"{label:>8} {objects:8d} {collections:8d} {churn:8.0f} {statistics.mean(times) / 1000:8.2f} "
+              f"{statistics.pstdev(times) / 1000:9.2f} {ordered[int(len(ordered) * 0.99)] / 1000:8.2f} "
+              f"{ordered[-1] / 1000:8.2f}")
 
-# --- Game State Initialization ---
+def benchmark_particles(sizes=(500, 1000, 2000, 4000, 8000), frames=60):
+    """Prints update+draw time per frame for Particle sprites against the pooled ParticleSystem."""
+    canvas = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    print(f"{'particles':>9} {'sprites ms':>11} {'pooled ms':>10} {'speedup':>8}")
+    for count in sizes:
+        bursts = count // 12
+        group = pygame.sprite.Group()
+        system = ParticleSystem(capacity=count)
 
-all_sprites = pygame.sprite.Group()
-bullets = pygame.sprite.Group()
-enemies = pygame.sprite.Group()
-particles = pygame.sprite.Group()
-powerups = pygame.sprite.Group()
+        start = time.perf_counter()
+        for frame in range(frames):
+            # Keep the population steady: replace what expired with fresh bursts
+            while len(group) < count:
+                for _ in range(12):
+                    group.add(Particle(random.randint(0, SCREEN_WIDTH), random.randint(0, SCREEN_HEIGHT),
+                                       (255, 50, 50)))
+            group.update()
+            group.draw(canvas)
+        sprites = (time.perf_counter() - start) / frames
+
+        start = time.perf_counter()
+        for frame in range(frames):
+            while len(system) < count - 11:
+                system.emit(random.randint(0, SCREEN_WIDTH), random.randint(0, SCREEN_HEIGHT), (255, 50, 50))
+            system.update()
+            system.draw(canvas)
+        pooled = (time.perf_counter() - start) / frames
+
+        print(f"{bursts * 12:9d} {sprites * 1000:11.3f} {pooled * 1000:10.3f} {sprites / pooled:7.1f}x")
 
-player = Player()
-all_sprites.add(player)
+def benchmark_motion(star_counts=(50, 500, 2000, 8000), enemy_counts=(10, 50, 200, 800), frames=600):
+    """
+    Prints the movement cost per frame of the old per-object updates (a list of star lists,
+    Enemy.update() with math.sin per zigzag enemy) against Starfield and EnemyMotion.
+    """
+    print(f"{'stars':>7} {'lists us':>9} {'numpy us':>9} {'speedup':>8}")
+    for count in star_counts:
+        field = Starfield(count)
+        stars = [[x, y] for x, y in zip(field.xs.tolist(), field.ys.tolist())]
+        start = time.perf_counter()
+        for frame in range(frames):
+            for star in stars:
+                star[1] = (star[1] + 1.5) % SCREEN_HEIGHT
+        lists = (time.perf_counter() - start) / frames
+        start = time.perf_counter()
+        for frame in range(frames):
+            field.update()
+        vectorised = (time.perf_counter() - start) / frames
+        print(f"{count:7d} {lists * 1e6:9.1f} {vectorised * 1e6:9.1f} {lists / vectorised:7.1f}x")
 
-score = 0
-current_wave_enemies = []
-spawn_timer = 0
-spawn_delay = 45 # Frames between individual enemy spawns
-spawn_index = 0
-wave_number = 1
+    def spawn(count):
+        # Enemies spread over a tall band above the screen so none leave it during the run
+        rng = random.Random(19)
+        return [Enemy(rng.randint(50, 750), rng.randint(-2000, -700), rng.choice(["standard", "zigzag", "tank"]))
+                for _ in range(count)]
+
+    print(f"{'enemies':>7} {'sprites us':>11} {'numpy us':>9} {'speedup':>8}")
+    for count in enemy_counts:
+        group = pygame.sprite.Group(spawn(count))
+        start = time.perf_counter()
+        for frame in range(frames):
+            group.update()
+        sprites = (time.perf_counter() - start) / frames
+
+        motion = EnemyMotion()
+        for enemy in spawn(count):
+            motion.add(enemy)
+        start = time.perf_counter()
+        for frame in range(frames):
+            motion.update()
+        vectorised = (time.perf_counter() - start) / frames
+        print(f"{count:7d} {sprites * 1e6:11.1f} {vectorised * 1e6:9.1f} {sprites / vectorised:7.1f}x")
+
+def rss_kb():
+    """Current resident set size of this process in KB (the peak RSS where /proc isn't available)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, AttributeError):
+        if resource is None:
+            return 0
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def benchmark_soak(minutes=30, seed=0):
+    """
+    Plays 'minutes' of simulated time with the ScriptedInput bot (a new game starts whenever it
+    dies) and prints, for every simulated minute, the current and peak group sizes and the
+    process RSS. Any entity that is never despawned shows up here as steady growth.
+    """
+    source = ScriptedInput(seed)
+    game = Game(seed)
+    games = 1
+    peaks = dict.fromkeys(("bullets", "enemies", "powerups", "sprites", "particles"), 0)
+    start = time.perf_counter()
+    print(f"{'minute':>6} {'games':>5} {'bullets':>11} {'enemies':>11} {'powerups':>11} "
+          f"{'sprites':>11} {'particles':>11} {'rss KB':>8}")
+    for frame in range(1, minutes * 60 * FPS + 1):
+        if not game.running:
+            game = Game(seed + games)
+            games += 1
+        game.step(source.poll(game))
+        sizes = {"bullets": len(game.bullets), "enemies": len(game.enemies), "powerups": len(game.powerups),
+                 "sprites": len(game.all_sprites), "particles": len(game.particles)}
+        for name, size in sizes.items():
+            if size > peaks[name]:
+                peaks[name] = size
+        if frame % (60 * FPS) == 0:
+            # Finished games are reference cycles (the collision handlers are bound methods), so
+            # collect them first: RSS should only grow here if something is really kept alive
+            gc.collect()
+            # Each column is "now/peak so far"
+            print(f"{frame // (60 * FPS):6d} {games:5d} "
+                  + " ".join(f"{f'{sizes[name]}/{peaks[name]}':>11}" for name in peaks)
+                  + f" {rss_kb():8d}")
+    print(f"{minutes} simulated minutes in {time.perf_counter() - start:.1f} s")
+
+def benchmark_waves(wave_numbers=(1, 10, 30, 100, 300), repeats=200):
+    """
+    Prints the cost of building one generated wave script, with the formation geometry cache
+    cold (cleared before every build) and warm. With prefetching this work happens on a
+    quiet frame, and the wave boundary itself only swaps in the ready script.
+    """
+    rng = random.Random(22)
+    print(f"{'wave':>5} {'enemies':>8} {'cold us':>8} {'warm us':>8} {'boundary us':>12}")
+    for wave_number in wave_numbers:
+        start = time.perf_counter()
+        for _ in range(repeats):
+            formation_cache.clear()
+            prepare_wave(wave_number, rng)
+        cold = (time.perf_counter() - start) / repeats
+        start = time.perf_counter()
+        for _ in range(repeats):
+            prepare_wave(wave_number, rng)
+        warm = (time.perf_counter() - start) / repeats
 
-prepare_wave()
+        scheduler = WaveScheduler(rng)
+        for _ in range(wave_number - 1):
+            scheduler.next_wave()
+        scheduler.prefetch()
+        start = time.perf_counter()
+        script = scheduler.next_wave()
+        boundary = time.perf_counter() - start
+        assert len(script) == 6 + wave_number * 2
+        print(f"{wave_number:5d} {6 + wave_number * 2:8d} {cold * 1e6:8.1f} {warm * 1e6:8.1f} {boundary * 1e6:12.1f}")
 
 # Title Graphic
 TITLE_ART = [
@@ -253,118 +1226,982 @@ TITLE_ART = [
     "  XX  XX  XX  XX  XX  XX  XX  XX  ",
     "   XXXX   XXXXXX  XX  XXXX    XXXX"
 ]
-title_surf = pixel_art_to_surface(TITLE_ART, scale=6, color=(0, 255, 255))
-title_rect = title_surf.get_rect(center=(SCREEN_WIDTH // 2, 250))
-
-# Starfield Background
-stars = [[random.randint(0, SCREEN_WIDTH), random.randint(0, SCREEN_HEIGHT)] for _ in range(50)]
-
-# --- Main Game Loop ---
-
-running = True
-while running:
-    # 1. Event Handling
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-        elif event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
-            if player.cooldown <= 0:
-                mode = player.weapon_mode
-                if mode == "laser":
-                    bullet = Bullet(player.rect.centerx, player.rect.centery)
-                    bullets.add(bullet)
-                    all_sprites.add(bullet)
-                elif mode == "spread":
-                    for dx in (-2, 0, 2): # Shoots 3 bullets at different angles
-                        bullet = Bullet(player.rect.centerx + dx*8, player.rect.centery, dx, -5)
-                        bullets.add(bullet)
-                        all_sprites.add(bullet)
-                elif mode == "charge":
-                    # Placeholder for charge shot logic
-                    bullet = Bullet(player.rect.centerx, player.rect.centery)
-                    bullets.add(bullet)
-                    all_sprites.add(bullet)
-                
-                player.cooldown = 15
-
-    # 2. Input Processing (Continuous movement)
-    keys = pygame.key.get_pressed()
-    if keys[pygame.K_LEFT]:
-        player.move(-1)
-    if keys[pygame.K_RIGHT]:
-        player.move(1)
-
-    # 3. Update Logic
-    all_sprites.update()
-    player.update_weapon_timer()
-    
-    # --- Collision: Bullets vs Enemies ---
-    for bullet in bullets:
-        hits = pygame.sprite.spritecollide(bullet, enemies, False)
-        for enemy in hits:
-            if enemy.take_damage(20):
-                score += 10
-                # Spawn explosion particles
-                for _ in range(12):
-                    p = Particle(enemy.rect.centerx, enemy.rect.centery, (255, 50, 50))
-                    particles.add(p)
-                    all_sprites.add(p)
-                
-                # Chance to drop a PowerUp
-                if random.random() < 0.35:
-                    kind = random.choice(["heal", "weapon"])
-                    pu = PowerUp(enemy.rect.centerx, enemy.rect.centery, kind)
-                    powerups.add(pu)
-                    all_sprites.add(pu)
-                
-                enemy.kill()
-            bullet.kill() # Bullet dies on impact
-    
-    # --- Collision: Player vs Enemies ---
-    player_hits = pygame.sprite.spritecollide(player, enemies, True)
-    if player_hits:
-        if player.take_damage(20):
-             running = False # Game Over logic
-
-    # --- Collision: PowerUps ---
-    pu_hits = pygame.sprite.spritecollide(player, powerups, True)
-    for pu in pu_hits:
+TITLE_COLOR = (0, 255, 255)
+
+# --- Input Sources ---
+
+# Bits of a recorded FrameInput (the overlay toggle doesn't affect the game, so it isn't recorded)
+FIRE_BIT = 1 << 0
+LEFT_BIT = 1 << 1
+RIGHT_BIT = 1 << 2
+QUIT_BIT = 1 << 3
+
+class FrameInput:
+    """The player's controls for one simulation step."""
+    __slots__ = ("fire", "left", "right", "quit", "toggle_overlay")
+
+    def __init__(self, fire=False, left=False, right=False, quit=False, toggle_overlay=False):
+        self.fire = fire
+        self.left = left
+        self.right = right
+        self.quit = quit
+        self.toggle_overlay = toggle_overlay
+
+    def to_bits(self):
+        return ((FIRE_BIT if self.fire else 0) | (LEFT_BIT if self.left else 0)
+                | (RIGHT_BIT if self.right else 0) | (QUIT_BIT if self.quit else 0))
+
+    @classmethod
+    def from_bits(cls, bits):
+        return cls(fire=bool(bits & FIRE_BIT), left=bool(bits & LEFT_BIT),
+                   right=bool(bits & RIGHT_BIT), quit=bool(bits & QUIT_BIT))
+
+class KeyboardInput:
+    """Reads the real window events and keyboard state."""
+    def poll(self, game):
+        controls = FrameInput()
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                controls.quit = True
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
+                controls.fire = True
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                controls.toggle_overlay = True
+        # Continuous movement
+        keys = pygame.key.get_pressed()
+        controls.left = bool(keys[pygame.K_LEFT])
+        controls.right = bool(keys[pygame.K_RIGHT])
+        return controls
+
+class ScriptedInput:
+    """
+    A simple bot for headless runs: it fires whenever the weapon is ready and wanders
+    left and right, holding each direction for a random number of frames.
+    It has its own seeded RNG, so the same seed always produces the same inputs.
+    """
+    def __init__(self, seed=0):
+        self.rng = random.Random(seed)
+        self.direction = 0
+        self.hold = 0
+
+    def poll(self, game):
+        if self.hold <= 0:
+            self.direction = self.rng.choice((-1, 0, 1))
+            self.hold = self.rng.randint(10, 60)
+        self.hold -= 1
+        return FrameInput(fire=game.player.cooldown <= 0,
+                          left=self.direction < 0, right=self.direction > 0)
+
+class HunterInput:
+    """
+    A bot that lines up under the lowest enemy on screen and fires whenever the weapon is
+    ready, stepping aside when that enemy is about to ram it. It only reacts to the game
+    state, so it needs no RNG (the seed argument matches ScriptedInput).
+    """
+    def __init__(self, seed=0):
+        self.seed = seed
+
+    def poll(self, game):
+        player = game.player.rect
+        target = None
+        for enemy in game.enemies:
+            rect = enemy.rect
+            if rect.bottom > 0 and (target is None or rect.bottom > target.bottom):
+                target = rect
+        left = right = False
+        if target is not None:
+            if target.bottom > player.top - 40 and abs(target.centerx - player.centerx) < target.width:
+                # About to be rammed: step away from it
+                left = target.centerx >= player.centerx
+                right = not left
+            elif target.centerx < player.centerx - 4:
+                left = True
+            elif target.centerx > player.centerx + 4:
+                right = True
+        return FrameInput(fire=game.player.cooldown <= 0, left=left, right=right)
+
+# Bots the batch simulator can play with, by name
+BOTS = {"wander": ScriptedInput, "hunter": HunterInput}
+
+# --- Game State ---
+
+# Sections of a frame that are timed separately (nanoseconds, summed over the session)
+PHASES = ("input", "update", "culling", "collisions", "spawning", "draw")
+
+class Balance:
+    """
+    The tunable gameplay numbers. Game(balance=...) plays with a different set, which is
+    what the batch simulator sweeps over.
+    """
+    FIELDS = ("enemy_weights", "drop_chance", "bullet_damage", "ram_damage", "heal_amount")
+
+    def __init__(self, enemy_weights=ENEMY_WEIGHTS, drop_chance=0.35, bullet_damage=20, ram_damage=20,
+                 heal_amount=25):
+        self.enemy_weights = tuple(enemy_weights) # standard, zigzag, tank
+        self.enemy_cum_weights = tuple(accumulate(self.enemy_weights))
+        self.drop_chance = drop_chance            # chance a destroyed enemy drops a powerup
+        self.bullet_damage = bullet_damage        # damage one bullet does to an enemy
+        self.ram_damage = ram_damage              # damage the player takes from ramming an enemy
+        self.heal_amount = heal_amount            # health a heal powerup restores
+
+    def replace(self, **changes):
+        """A copy with some numbers changed."""
+        values = {field: getattr(self, field) for field in self.FIELDS}
+        values.update(changes)
+        return Balance(**values)
+
+    def describe(self):
+        return " ".join(f"{field}={'/'.join(map(str, value)) if field == 'enemy_weights' else value}"
+                        for field, value in ((field, getattr(self, field)) for field in self.FIELDS))
+
+class Game:
+    """
+    All the state of one play session. step() advances the simulation by exactly one fixed
+    1/60 s frame from a FrameInput, and draw() renders it, so the same game logic runs in a
+    window, headless, or faster than real time.
+    Every random choice the game makes comes from its own RNG, so the same seed and the same
+    inputs always play out the same way.
+    """
+    def __init__(self, seed=None, cull_margin=CULL_MARGIN, wave_file=None, balance=None):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.balance = balance or Balance()
+        self.bounds = WorldBounds(cull_margin)
+        self.all_sprites = pygame.sprite.Group()
+        self.bullets = pygame.sprite.Group()
+        self.enemies = pygame.sprite.Group()
+        self.particles = ParticleSystem(rng=self.rng)
+        self.enemy_motion = EnemyMotion()
+        self.powerups = pygame.sprite.Group()
+
+        self.player = Player()
+        self.all_sprites.add(self.player)
+        self.player_group = pygame.sprite.GroupSingle(self.player)
+
+        # Recyclers for the entities that are spawned and destroyed all the time
+        self.bullet_pool = EntityPool(Bullet, 256)
+        self.enemy_pool = EntityPool(Enemy, 128)
+        self.powerup_pool = EntityPool(PowerUp, 32)
+
+        # Which layers collide, and what happens when they do
+        self.collisions = CollisionSystem()
+        self.collisions.register(BULLET_LAYER, ENEMY_LAYER, self.bullet_hits_enemy)
+        self.collisions.register(PLAYER_LAYER, ENEMY_LAYER, self.player_hits_enemy)
+        self.collisions.register(PLAYER_LAYER, POWERUP_LAYER, self.player_hits_powerup)
+
+        self.score = 0
+        self.spawn_timer = 0 # Frames since the last enemy spawn
+        self.spawn_index = 0
+        self.wave_number = 1
+        self.waves = WaveScheduler(random.Random(self.rng.getrandbits(64)), wave_file,
+                                   self.balance.enemy_cum_weights)
+        self.current_wave = self.waves.next_wave()
+
+        self.running = True
+        self.frame = 0
+        self.timings = dict.fromkeys(PHASES, 0)
+
+        # Starfield Background
+        self.stars = Starfield(50, rng=self.rng)
+
+    # --- Collision Handlers ---
+
+    def bullet_hits_enemy(self, bullet, enemy):
+        if enemy.take_damage(self.balance.bullet_damage):
+            self.score += 10
+            # Spawn explosion particles
+            self.particles.emit(enemy.rect.centerx, enemy.rect.centery, (255, 50, 50), 12)
+
+            # Chance to drop a PowerUp
+            if self.rng.random() < self.balance.drop_chance:
+                kind = self.rng.choice(["heal", "weapon"])
+                pu = self.powerup_pool.acquire(enemy.rect.centerx, enemy.rect.centery, kind)
+                self.powerups.add(pu)
+                self.all_sprites.add(pu)
+
+            enemy.kill()
+        bullet.kill() # Bullet dies on impact
+
+    def player_hits_enemy(self, player, enemy):
+        enemy.kill()
+        if player.take_damage(self.balance.ram_damage):
+            self.running = False # Game Over logic
+
+    def player_hits_powerup(self, player, pu):
+        pu.kill()
         if pu.kind == "heal":
-            player.health = min(100, player.health + 25)
+            player.health = min(100, player.health + self.balance.heal_amount)
         elif pu.kind == "weapon":
-            new_weapon = random.choice(["spread", "charge"])
+            new_weapon = self.rng.choice(["spread", "charge"])
             player.upgrade_weapon(new_weapon)
 
-    # --- Spawning Logic ---
-    spawn_timer += 1
-    if spawn_timer >= spawn_delay and spawn_index < len(current_wave_enemies):
-        x, y, etype = current_wave_enemies[spawn_index]
-        enemy = Enemy(x, y, etype)
-        enemies.add(enemy)
-        all_sprites.add(enemy)
-        spawn_index += 1
-        spawn_timer = 0
+    # --- Simulation ---
+
+    def spawn_bullet(self, x, y, dx=0, dy=-8):
+        bullet = self.bullet_pool.acquire(x, y, dx, dy)
+        self.bullets.add(bullet)
+        self.all_sprites.add(bullet)
+
+    def fire(self):
+        player = self.player
+        mode = player.weapon_mode
+        if mode == "laser":
+            self.spawn_bullet(player.rect.centerx, player.rect.centery)
+        elif mode == "spread":
+            for dx in (-2, 0, 2): # Shoots 3 bullets at different angles
+                self.spawn_bullet(player.rect.centerx + dx*8, player.rect.centery, dx, -5)
+        elif mode == "charge":
+            # Placeholder for charge shot logic
+            self.spawn_bullet(player.rect.centerx, player.rect.centery)
+        player.cooldown = 15
+
+    def step(self, controls):
+        """Advances the game by one fixed frame."""
+        timings = self.timings
+        started = time.perf_counter_ns()
+
+        # 1. Input
+        if controls.quit:
+            self.running = False
+        if controls.fire and self.player.cooldown <= 0:
+            self.fire()
+        if controls.left:
+            self.player.move(-1)
+        if controls.right:
+            self.player.move(1)
+        now = time.perf_counter_ns()
+        timings["input"] += now - started
+        started = now
+
+        # 2. Update Logic
+        self.bullets.update()
+        self.enemy_motion.update()
+        self.powerups.update()
+        self.particles.update()
+        self.player.update_weapon_timer()
+        self.stars.update()
+        now = time.perf_counter_ns()
+        timings["update"] += now - started
+        started = now
 
-    # If all enemies in wave are spawned and killed, start next wave
-    if spawn_index >= len(current_wave_enemies) and not enemies:
-        wave_number += 1
-        prepare_wave()
+        # 3. Culling: despawn whatever left the world before it takes part in collisions
+        bounds = self.bounds
+        bounds.cull(self.bullets, bounds.outgoing)
+        bounds.cull(self.enemies, bounds.incoming)
+        bounds.cull(self.powerups, bounds.incoming)
+        now = time.perf_counter_ns()
+        timings["culling"] += now - started
+        started = now
 
-    if player.cooldown > 0:
-        player.cooldown -= 1
+        # 4. Collisions: re-bucket moved sprites, then handle every registered layer pair in one pass
+        self.collisions.sync(self.player_group, self.bullets, self.enemies, self.powerups)
+        self.collisions.process()
+        now = time.perf_counter_ns()
+        timings["collisions"] += now - started
+        started = now
 
-    # 4. Drawing
-    screen.fill((5, 5, 30)) # Dark space blue
+        # 5. Spawning Logic
+        self.spawn_timer += 1
+        wave = self.current_wave
+        if self.spawn_index < len(wave) and self.spawn_timer >= wave[self.spawn_index][0]:
+            _, x, y, etype = wave[self.spawn_index]
+            enemy = self.enemy_pool.acquire(x, y, etype)
+            self.enemy_motion.add(enemy)
+            self.enemies.add(enemy)
+            self.all_sprites.add(enemy)
+            self.spawn_index += 1
+            self.spawn_timer = 0
+        elif self.spawn_index >= len(wave) and not self.enemies:
+            # All enemies in wave are spawned and killed: start next wave
+            self.wave_number += 1
+            self.current_wave = self.waves.next_wave()
+            self.spawn_index = 0
+        else:
+            # Nothing spawned this frame, so it's a good time to build the next wave's script
+            self.waves.prefetch()
+
+        if self.player.cooldown > 0:
+            self.player.cooldown -= 1
+        timings["spawning"] += time.perf_counter_ns() - started
+        self.frame += 1
+
+    def draw(self, screen, clear=True):
+        """
+        Draws the frame and returns the list of rects it drew into. With clear=False the
+        background is left to the caller (DirtyRenderer only restores what last frame covered).
+        """
+        started = time.perf_counter_ns()
+        if clear:
+            screen.blit(background_surface(), (0, 0))
+
+        rects = self.stars.draw(screen)
+
+        rects += screen.blits([(sprite.image, sprite.rect) for sprite in self.all_sprites])
+        rects += self.particles.draw(screen)
+        self.timings["draw"] += time.perf_counter_ns() - started
+        return rects
+
+    def state_hash(self):
+        """
+        A short digest of everything that decides how the game plays on: counters, the player,
+        every entity's position, the particles, the stars and the RNG state. Two runs with the
+        same seed and inputs have the same hash after every step.
+        """
+        digest = hashlib.blake2b(digest_size=8)
+        player = self.player
+        digest.update(repr((self.frame, self.score, self.wave_number, self.spawn_index, self.spawn_timer,
+                            self.running, tuple(player.rect), player.health, player.cooldown,
+                            player.weapon_mode, player.weapon_timer)).encode())
+        digest.update(repr([(tuple(e.rect), e.health) for e in self.enemy_motion.enemies]).encode())
+        digest.update(repr([tuple(b.rect) for b in self.bullets]).encode())
+        digest.update(repr([(tuple(p.rect), p.kind) for p in self.powerups]).encode())
+        n = self.enemy_motion.count
+        for array in (self.enemy_motion.xs[:n], self.enemy_motion.ys[:n], self.enemy_motion.angles[:n],
+                      self.particles.positions, self.particles.life, self.stars.ys):
+            digest.update(array.tobytes())
+        digest.update(repr(self.rng.getstate()).encode())
+        return digest.digest()
+
+# --- Profiling ---
+
+class FrameProfiler:
+    """
+    Turns Game.timings into per-frame numbers: it keeps a rolling window of frame times for
+    percentiles, draws a toggleable overlay (F3) and can write every frame to a CSV trace.
+    """
+    def __init__(self, window=300, trace_path=None):
+        self.frame_times = deque(maxlen=window) # nanoseconds of work per recorded frame
+        self.visible = False
+        self.font = None
+        self.game = None
+        self.previous = dict.fromkeys(PHASES, 0)
+        self.trace_file = None
+        self.trace = None
+        if trace_path:
+            self.trace_file = open(trace_path, "w", newline="")
+            self.trace = csv.writer(self.trace_file)
+            self.trace.writerow(["frame"] + [f"{phase}_us" for phase in PHASES]
+                                + ["total_us", "bullets", "enemies", "powerups", "particles"])
 
-    # Update and Draw Starfield
-    for star in stars:
-        pygame.draw.circle(screen, (200, 200, 200), star, 1)
-        star[1] = (star[1] + 1.5) % SCREEN_HEIGHT # Stars wrap around screen
+    def record(self, game):
+        """Stores the time each phase took since the last call (one rendered or simulated frame)."""
+        if game is not self.game:
+            # A new game started: its counters begin at zero again
+            self.game = game
+            self.previous = dict.fromkeys(PHASES, 0)
+        deltas = [game.timings[phase] - self.previous[phase] for phase in PHASES]
+        self.previous = dict(game.timings)
+        total = sum(deltas)
+        self.frame_times.append(total)
+        if self.trace is not None:
+            self.trace.writerow([game.frame] + [round(delta / 1000, 1) for delta in deltas]
+                                + [round(total / 1000, 1), len(game.bullets), len(game.enemies),
+                                   len(game.powerups), len(game.particles)])
 
-    all_sprites.draw(screen)
-    screen.blit(title_surf, title_rect) # Draw the "Neon Void" logo
+    def percentile(self, fraction):
+        """Frame time (ns) below which 'fraction' of the recent frames fall."""
+        if not self.frame_times:
+            return 0
+        ordered = sorted(self.frame_times)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
 
+    def draw(self, screen, game, fps):
+        """Draws the overlay (when visible) and returns the rects it covered."""
+        if not self.visible:
+            return []
+        if self.font is None:
+            self.font = pygame.font.Font(None, 20)
+        lines = [
+            f"FPS {fps:5.1f}",
+            f"frame p50 {self.percentile(0.5) / 1e6:5.2f} ms  p99 {self.percentile(0.99) / 1e6:5.2f} ms",
+            f"bullets {len(game.bullets)}  enemies {len(game.enemies)}  "
+            f"powerups {len(game.powerups)}  particles {len(game.particles)}",
+        ]
+        return [screen.blit(self.font.render(line, True, (0, 255, 120)), (8, 8 + row * 18))
+                for row, line in enumerate(lines)]
+
+    def close(self):
+        if self.trace_file is not None:
+            self.trace_file.close()
+
+# --- Rendering ---
+
+class DirtyRenderer:
+    """
+    Sends only the changed parts of the screen to the display. Each frame begin() paints the
+    cached background back over whatever was drawn last frame, the game draws on top, and
+    present() updates just last frame's rects plus this frame's. When a frame touches too
+    many rects (a big explosion) one full flip is cheaper than updating them one by one.
+    """
+    def __init__(self, screen, max_rects=400):
+        self.screen = screen
+        self.max_rects = max_rects
+        self.previous = None # rects drawn last frame, None means the whole screen is stale
+
+    def begin(self):
+        background = background_surface()
+        if self.previous is None:
+            self.screen.blit(background, (0, 0))
+        else:
+            self.screen.blits([(background, rect, rect) for rect in self.previous], doreturn=False)
+
+    def present(self, rects):
+        if self.previous is None or len(self.previous) + len(rects) > self.max_rects:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.previous + rects)
+        self.previous = rects
+
+    def invalidate(self):
+        """Forces the next frame to repaint and flip the whole screen (e.g. after a new game)."""
+        self.previous = None
+
+# --- Recording & Replay ---
+
+class InputLog:
+    """
+    A compact binary recording of a session: the seed, one byte of FrameInput bits per
+    simulation step, a state hash every 'checkpoint' steps and one of the final state.
+    Replaying the inputs from the same seed must reproduce the same hashes, so a heavy
+    session can be rerun exactly on another build.
+    File layout: header (magic, version, seed, steps, checkpoint, hash count), the input
+    bytes, the 8-byte checkpoint hashes, then the 8-byte final hash.
+    """
+    MAGIC = b"NVRP"
+    VERSION = 2
+    HEADER = struct.Struct("<4sBQIII")
+    HASH_SIZE = 8
+
+    def __init__(self, seed, checkpoint=600):
+        self.seed = seed
+        self.checkpoint = checkpoint
+        self.inputs = bytearray()
+        self.hashes = []
+        self.final = None
+
+    def __len__(self):
+        return len(self.inputs)
+
+    def record(self, controls, game):
+        """Logs the controls of the step 'game' just took, hashing its state at every checkpoint."""
+        self.inputs.append(controls.to_bits())
+        if len(self.inputs) % self.checkpoint == 0:
+            self.hashes.append(game.state_hash())
+
+    def save(self, path, game):
+        """Writes the log to 'path', ending with the state hash of 'game' (the game the last step ran in)."""
+        self.final = game.state_hash()
+        with open(path, "wb") as f:
+            f.write(self.HEADER.pack(self.MAGIC, self.VERSION, self.seed, len(self.inputs),
+                                     self.checkpoint, len(self.hashes)))
+            f.write(self.inputs)
+            f.write(b"".join(self.hashes))
+            f.write(self.final)
+
+    @classmethod
+    def load(cls, path):
+        """Reads a log written by save(). Raises ValueError if it isn't one or was cut short."""
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < cls.HEADER.size:
+            raise ValueError(f"{path} is too short to be an input log")
+        magic, version, seed, steps, checkpoint, hash_count = cls.HEADER.unpack_from(data)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError(f"{path} is not a version {cls.VERSION} input log")
+        expected = cls.HEADER.size + steps + (hash_count + 1) * cls.HASH_SIZE
+        if len(data) != expected:
+            raise ValueError(f"{path} is {len(data)} bytes but its header describes {expected}; "
+                             f"the log is truncated or corrupt")
+        log = cls(seed, checkpoint)
+        offset = cls.HEADER.size
+        log.inputs = bytearray(data[offset:offset + steps])
+        offset += steps
+        log.hashes = [data[offset + i * cls.HASH_SIZE:offset + (i + 1) * cls.HASH_SIZE]
+                      for i in range(hash_count)]
+        offset += hash_count * cls.HASH_SIZE
+        log.final = data[offset:offset + cls.HASH_SIZE]
+        return log
+
+# --- Game Loops ---
+
+def run_window(screen, profiler, seed=None, record_path=None, wave_file=None, startup=None):
+    """
+    The interactive loop. Game time advances in fixed 1/60 s steps: a slow frame runs extra
+    steps to catch up (up to MAX_CATCH_UP_STEPS) instead of slowing the game down.
+    With 'record_path' every step's input is saved to an InputLog when the game ends.
+    A StartupTimer passed as 'startup' is completed and reported after the first frame.
+    """
+    if seed is None:
+        seed = random.randrange(2 ** 32) # Picked here so a recording knows it
+    game = Game(seed, wave_file=wave_file)
+    log = InputLog(seed) if record_path else None
+    source = KeyboardInput()
+    renderer = DirtyRenderer(screen)
+    clock = pygame.time.Clock()
+    step_ms = 1000 / FPS
+    lag = 0.0
+    while game.running:
+        lag += clock.tick(FPS)
+        controls = source.poll(game)
+        if controls.quit:
+            break
+        if controls.toggle_overlay:
+            profiler.visible = not profiler.visible
+
+        steps = 0
+        while lag >= step_ms and steps < MAX_CATCH_UP_STEPS and game.running:
+            game.step(controls)
+            if log is not None:
+                log.record(controls, game)
+            # A key press only fires once, even when several steps run this frame
+            controls = FrameInput(left=controls.left, right=controls.right)
+            lag -= step_ms
+            steps += 1
+        if steps == MAX_CATCH_UP_STEPS:
+            lag = 0.0
+
+        renderer.begin()
+        rects = game.draw(screen, clear=False)
+        profiler.record(game)
+        rects += profiler.draw(screen, game, clock.get_fps())
+        renderer.present(rects)
+        if startup is not None:
+            startup.mark("first frame")
+            startup.report()
+            startup = None
+
+    if log is not None:
+        log.save(record_path, game)
+        print(f"Recorded {len(log)} steps (seed {seed}) to {record_path}")
+
+def print_phase_report(timings, frames):
+    """Prints the average time per frame spent in each phase."""
+    total = sum(timings.values()) or 1
+    for phase in PHASES:
+        print(f"  {phase:<11} {timings[phase] / frames / 1000:9.1f} us/frame {timings[phase] / total * 100:6.1f}%")
+
+def simulate(frames, seed, controls_for, profiler, screen=None, log=None, wave_file=None):
+    """
+    Runs 'frames' fixed steps as fast as possible and prints the simulated frames per second
+    and per-phase timings. controls_for(game, frame) supplies each step's FrameInput. When a
+    game ends the next one starts, seeded with seed + its index, so a session is fully
+    determined by its seed and inputs. Every step is recorded into 'log' if one is given.
+    Pass the (dummy) display surface as 'screen' to include drawing in the measurement.
+    """
+    renderer = DirtyRenderer(screen) if screen is not None else None
+    timings = dict.fromkeys(PHASES, 0)
+    games = [Game(seed, wave_file=wave_file)]
+    start = time.perf_counter()
+    for frame in range(frames):
+        game = games[-1]
+        if not game.running:
+            game = Game(seed + len(games), wave_file=wave_file)
+            games.append(game)
+            if renderer is not None:
+                renderer.invalidate()
+        controls = controls_for(game, frame)
+        game.step(controls)
+        if log is not None:
+            log.record(controls, game)
+        if renderer is not None:
+            renderer.begin()
+            renderer.present(game.draw(screen, clear=False))
+        profiler.record(game)
+    elapsed = time.perf_counter() - start
+
+    for game in games:
+        for phase in PHASES:
+            timings[phase] += game.timings[phase]
+    best = max(games, key=lambda game: game.score)
+    print(f"{frames} frames in {elapsed:.2f} s = {frames / elapsed:.0f} simulated FPS "
+          f"({frames / elapsed / FPS:.1f}x real time)")
+    print(f"{len(games)} game(s), best score {best.score} reaching wave {best.wave_number}")
+    print(f"frame time p50 {profiler.percentile(0.5) / 1000:.1f} us, "
+          f"p99 {profiler.percentile(0.99) / 1000:.1f} us (last {len(profiler.frame_times)} frames)")
+    print_phase_report(timings, frames)
+    return games
+
+def run_headless(frames, profiler, seed=0, screen=None, record_path=None, wave_file=None):
+    """Simulates 'frames' steps driven by the ScriptedInput bot, optionally recording them."""
+    source = ScriptedInput(seed)
+    log = InputLog(seed) if record_path else None
+    games = simulate(frames, seed, lambda game, frame: source.poll(game), profiler, screen, log, wave_file)
+    if log is not None:
+        log.save(record_path, games[-1])
+        print(f"Recorded {len(log)} steps (seed {seed}) to {record_path}")
+
+def run_replay(recorded, profiler, screen=None, wave_file=None):
+    """
+    Replays a recorded InputLog (see InputLog.load) at full speed, prints the timing report and checks every
+    checkpoint hash and the final state hash against the recording. Returns False on a desync.
+    A session recorded with a wave file only replays with the same wave file.
+    """
+    replayed = InputLog(recorded.seed, recorded.checkpoint)
+    inputs = recorded.inputs
+    if not inputs:
+        print("The recording holds no steps, so there is nothing to replay or compare")
+        return True
+    games = simulate(len(inputs), recorded.seed, lambda game, frame: FrameInput.from_bits(inputs[frame]),
+                     profiler, screen, replayed, wave_file)
+
+    for index, (expected, actual) in enumerate(zip(recorded.hashes, replayed.hashes)):
+        if expected != actual:
+            print(f"DESYNC at step {(index + 1) * recorded.checkpoint}: "
+                  f"recorded {expected.hex()}, replayed {actual.hex()}")
+            return False
+    # Steps after the last checkpoint are only covered by the final hash
+    final = games[-1].state_hash()
+    if final != recorded.final:
+        print(f"DESYNC by the final step {len(inputs)}: "
+              f"recorded {recorded.final.hex()}, replayed {final.hex()}")
+        return False
+    print(f"Replay matched all {len(recorded.hashes)} checkpoints and the final state "
+          f"after {len(inputs)} steps ({final.hex()})")
+    return True
+
+# --- Batch Simulation ---
+
+def play_games(seeds, bot, balance, max_frames, wave_file=None):
+    """
+    Worker job: plays one game per seed with the named bot, uncapped and without drawing, until
+    the player dies or 'max_frames' pass. Returns (score, wave, frames, died) for each game.
+    Nothing here needs a display, so workers never initialise one.
+    """
+    results = []
+    for seed in seeds:
+        game = Game(seed, wave_file=wave_file, balance=balance)
+        source = BOTS[bot](seed)
+        while game.running and game.frame < max_frames:
+            game.step(source.poll(game))
+        results.append((game.score, game.wave_number, game.frame, not game.running))
+    return results
+
+def simulate_batch(games, workers, bot="wander", balance=None, max_frames=FPS * 60 * 10, seed=0, wave_file=None):
+    """
+    Plays 'games' games seeded seed, seed + 1, ... across a process pool and returns their
+    results in seed order. Games are handed out in small chunks, because how long a game
+    lasts varies a lot and one long chunk would leave the other workers idle.
+    """
+    seeds = list(range(seed, seed + games))
+    if workers <= 1:
+        return play_games(seeds, bot, balance, max_frames, wave_file)
+    chunk = max(1, games // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        jobs = [pool.submit(play_games, seeds[start:start + chunk], bot, balance, max_frames, wave_file)
+                for start in range(0, games, chunk)]
+        results = []
+        for job in jobs:
+            # Re-raises any error from a worker
+            results.extend(job.result())
+    return results
+
+def parse_sweep(text):
+    """Turns "drop_chance=0.2,0.35" into ("drop_chance", [0.2, 0.35]); enemy weights are written 5/3/2."""
+    name, _, values = text.partition("=")
+    if name not in Balance.FIELDS or not values:
+        raise argparse.ArgumentTypeError(f"expected NAME=V1,V2,... with NAME one of {', '.join(Balance.FIELDS)}")
+    try:
+        if name == "enemy_weights":
+            parsed = [tuple(int(weight) for weight in value.split("/")) for value in values.split(",")]
+        else:
+            convert = float if name == "drop_chance" else int
+            parsed = [convert(value) for value in values.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"bad value in {text!r}") from None
+    for value in parsed:
+        if name == "enemy_weights":
+            if len(value) != len(ENEMY_KINDS) or min(value) < 0 or not sum(value):
+                raise argparse.ArgumentTypeError(
+                    f"enemy_weights needs {len(ENEMY_KINDS)} non-negative whole numbers with a positive sum "
+                    f"({'/'.join(ENEMY_KINDS)}), not {'/'.join(map(str, value))}")
+        elif name == "drop_chance":
+            if not 0 <= value <= 1:
+                raise argparse.ArgumentTypeError(f"drop_chance must be between 0 and 1, not {value:g}")
+        elif value < 0:
+            raise argparse.ArgumentTypeError(f"{name} cannot be negative, not {value}")
+    return name, parsed
+
+def run_simulation(games, workers, bot, sweeps, max_minutes, seed=0, wave_file=None):
+    """
+    Plays 'games' bot games for every combination of the swept Balance values (just the
+    defaults without sweeps) and prints score, wave and survival statistics per setting.
+    Every setting plays the same seeds, so differences come from the numbers, not the luck.
+    """
+    max_frames = max(1, int(max_minutes * 60 * FPS))
+    names = [name for name, _ in sweeps]
+    settings = [Balance().replace(**dict(zip(names, values)))
+                for values in product(*(values for _, values in sweeps))]
+    print(f"{games} games per setting with the '{bot}' bot on {workers} worker(s), "
+          f"capped at {max_minutes:g} minutes each")
+    print(f"{'died':>5} {'score avg':>9} {'p10':>5} {'p50':>5} {'p90':>5} {'wave avg':>8} {'max':>4} "
+          f"{'alive s':>8} {'games/s':>8}  setting")
+    total_games = 0
+    start = time.perf_counter()
+    for balance in settings:
+        setting_start = time.perf_counter()
+        results = simulate_batch(games, workers, bot, balance, max_frames, seed, wave_file)
+        elapsed = time.perf_counter() - setting_start
+        scores = sorted(score for score, _, _, _ in results)
+        waves = [wave for _, wave, _, _ in results]
+        deaths = sum(1 for _, _, _, died in results if died)
+        survival = statistics.mean(frames for _, _, frames, _ in results) / FPS
+        print(f"{deaths / games:5.0%} {statistics.mean(scores):9.1f} {scores[games // 10]:5d} "
+              f"{scores[games // 2]:5d} {scores[games * 9 // 10]:5d} {statistics.mean(waves):8.2f} "
+              f"{max(waves):4d} {survival:8.1f} {games / elapsed:8.1f}  {balance.describe()}")
+        total_games += games
+    elapsed = time.perf_counter() - start
+    print(f"{total_games} games in {elapsed:.1f} s = {total_games / elapsed:.1f} games/s")
+
+# --- Startup & Assets ---
+
+# Extra asset files for kiosk builds: name -> file name in ASSET_DIR. Sounds are loaded into
+# 'sounds' once the mixer is open, every other file into 'images' as a surface.
+ASSET_FILES = {}
+SOUND_EXTENSIONS = (".wav", ".ogg")
+sounds = {}
+images = {}
+
+ART_CACHE_VERSION = 1 # Bump when pixel_art_to_surface changes, so old cache files are ignored
+ART_HEADER = struct.Struct("<II") # width, height of a cached art file, followed by RGBA bytes
+
+class StartupTimer:
+    """Records how long each startup stage took, counting from LAUNCHED (before the imports)."""
+    def __init__(self):
+        self.last = LAUNCHED
+        self.stages = []
+
+    def mark(self, stage):
+        now = time.perf_counter()
+        self.stages.append((stage, now - self.last))
+        self.last = now
+
+    def report(self):
+        print("Startup:")
+        for stage, seconds in self.stages:
+            print(f"  {stage:<12} {seconds * 1000:8.1f} ms")
+        print(f"  {'total':<12} {(self.last - LAUNCHED) * 1000:8.1f} ms")
+
+def art_assets():
+    """Every (pattern, scale, color) the game draws with art_surface()."""
+    assets = [(PLAYER_SHIP_ART, 4, PLAYER_COLOR), (TITLE_ART, 6, TITLE_COLOR)]
+    for art, color, _, _ in ENEMY_TYPES.values():
+        if (art, 3, color) not in assets:
+            assets.append((art, 3, color))
+    return assets
+
+def art_hash(pattern, scale, color):
+    """Names a piece of art in the disk cache: any change to the pattern, scale or colour changes it."""
+    key = repr((ART_CACHE_VERSION, tuple(pattern), scale, color)).encode()
+    return hashlib.blake2b(key, digest_size=12).hexdigest()
+
+def load_art(pattern, scale, color, cache_dir=None):
+    """
+    Worker job: returns a pixel-art surface, read from the disk cache when it has one and written
+    to it after building otherwise. Files are raw RGBA, so loading is a copy rather than an
+    image decode. The surface is not converted yet; that happens on the main thread.
+    """
+    path = os.path.join(cache_dir, art_hash(pattern, scale, color) + ".rgba") if cache_dir else None
+    if path:
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            size = ART_HEADER.unpack_from(data)
+            return pygame.image.frombytes(data[ART_HEADER.size:], size, "RGBA")
+        except (OSError, ValueError, struct.error):
+            pass # Missing or damaged: build it again below
+    surf = pixel_art_to_surface(pattern, scale, color)
+    if path:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            # Write under a temporary name first, so another launch never reads half a file
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(ART_HEADER.pack(*surf.get_size()))
+                f.write(pygame.image.tobytes(surf, "RGBA"))
+            os.replace(temp_path, path)
+        except OSError:
+            pass # A read-only disk only means there is no cache
+    return surf
+
+def open_audio():
+    """Worker job: opens the mixer (slow on real audio hardware) and loads the sound files."""
+    try:
+        pygame.mixer.init()
+    except pygame.error:
+        return {} # No audio device: the game runs silent
+    return {name: pygame.mixer.Sound(os.path.join(ASSET_DIR, file_name))
+            for name, file_name in ASSET_FILES.items() if file_name.endswith(SOUND_EXTENSIONS)}
+
+def draw_loading_screen(screen, done, total):
+    screen.fill((5, 5, 30))
+    bar = pygame.Rect(0, 0, 400, 16)
+    bar.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+    pygame.draw.rect(screen, TITLE_COLOR, bar, 1)
+    progress = bar.inflate(-6, -6)
+    progress.width = progress.width * done // total
+    pygame.draw.rect(screen, TITLE_COLOR, progress)
     pygame.display.flip()
-    clock.tick(60)
 
-pygame.quit()
\ No newline at end of file
+def load_assets(screen, cache_dir=None, workers=4):
+    """
+    Builds or loads every asset on a thread pool while the main thread keeps a loading screen up
+    and the window responsive. Finished surfaces are converted and cached on the main thread as
+    their jobs complete. Returns False if the window was closed while loading.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        jobs = {}
+        for pattern, scale, color in art_assets():
+            jobs[pool.submit(load_art, pattern, scale, color, cache_dir)] = ("art", (tuple(pattern), scale, color))
+        jobs[pool.submit(open_audio)] = ("audio", None)
+        for name, file_name in ASSET_FILES.items():
+            if not file_name.endswith(SOUND_EXTENSIONS):
+                jobs[pool.submit(pygame.image.load, os.path.join(ASSET_DIR, file_name))] = ("image", name)
+
+        pending = set(jobs)
+        while pending:
+            finished, pending = wait(pending, timeout=1 / FPS, return_when=FIRST_COMPLETED)
+            for job in finished:
+                kind, key = jobs[job]
+                if kind == "art":
+                    install_surface(("art",) + key, job.result())
+                elif kind == "audio":
+                    sounds.update(job.result())
+                else:
+                    images[key] = job.result().convert_alpha()
+            if pygame.event.peek(pygame.QUIT):
+                for job in pending:
+                    job.cancel()
+                return False
+            if pending:
+                draw_loading_screen(screen, len(jobs) - len(pending), len(jobs))
+
+    # The remaining surfaces are simple shapes, quicker to draw than to hand to a thread
+    preload_surfaces()
+    return True
+
+# --- Entry Point ---
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="NEON VOID: Reloaded")
+    parser.add_argument("--headless", action="store_true",
+                        help="simulate without a window at uncapped speed, driven by a scripted bot")
+    parser.add_argument("--frames", type=int, default=FPS * 60 * 10,
+                        help="frames to simulate with --headless (default: 10 minutes of game time)")
+    parser.add_argument("--seed", type=int,
+                        help="game seed (default: 0 with --headless, random in a window)")
+    parser.add_argument("--render", action="store_true", help="with --headless or --replay, also draw every frame")
+    parser.add_argument("--record", dest="record_path", help="save every step's input to a replayable log file")
+    parser.add_argument("--replay", dest="replay_path",
+                        help="replay a recorded log headlessly at full speed and verify its state hashes")
+    parser.add_argument("--waves", dest="waves_path",
+                        help="JSON wave file to play before the generated waves")
+    parser.add_argument("--trace", dest="trace_path", help="write per-frame phase timings and entity counts to a CSV file")
+    parser.add_argument("--benchmark", action="store_true", help="run the stress benchmarks")
+    parser.add_argument("--simulate", type=int, metavar="GAMES",
+                        help="play GAMES headless bot games per setting across processes and print balance statistics")
+    parser.add_argument("--bot", choices=sorted(BOTS), default="wander", help="bot for --simulate (default: wander)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="processes for --simulate (default: one per CPU)")
+    parser.add_argument("--max-minutes", type=float, default=10,
+                        help="with --simulate, end a game that lasts this long (default: 10)")
+    parser.add_argument("--sweep", type=parse_sweep, action="append", default=[], metavar="NAME=V1,V2",
+                        help="with --simulate, try each value of a balance number "
+                             f"({', '.join(Balance.FIELDS)}; weights as 5/3/2). Repeat to sweep combinations")
+    parser.add_argument("--asset-cache", default=ASSET_CACHE_DIR,
+                        help=f"directory for prebaked sprite art (default: {ASSET_CACHE_DIR})")
+    parser.add_argument("--no-asset-cache", action="store_true", help="always build sprite art from scratch")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="print how long each startup stage took, up to the first interactive frame")
+    parser.add_argument("--soak", type=int, metavar="MINUTES", nargs="?", const=30,
+                        help="play MINUTES (default 30) of simulated time and report group sizes and RSS")
+    args = parser.parse_args(argv)
+
+    # Recordings store the seed as an unsigned 64-bit number
+    if args.seed is not None and not 0 <= args.seed < 2 ** 64:
+        parser.error("--seed must be between 0 and 2**64 - 1")
+    if args.simulate is not None and args.simulate <= 0:
+        parser.error("--simulate needs a positive number of games")
+    if args.workers <= 0:
+        parser.error("--workers must be positive")
+    if args.max_minutes <= 0:
+        parser.error("--max-minutes must be positive")
+    if args.soak is not None and args.soak <= 0:
+        parser.error("--soak needs a positive number of minutes")
+    # Read the wave file and recording now so a bad file is reported before any window or asset loading
+    args.wave_file = None
+    if args.waves_path:
+        try:
+            args.wave_file = load_waves(args.waves_path)
+        except (OSError, ValueError) as error:
+            parser.error(str(error))
+    args.replay_log = None
+    if args.replay_path:
+        try:
+            args.replay_log = InputLog.load(args.replay_path)
+        except (OSError, ValueError) as error:
+            parser.error(str(error))
+    return args
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    if args.simulate is not None:
+        # Pure simulation: no window, no display, no assets beyond what the games build themselves
+        run_simulation(args.simulate, args.workers, args.bot, args.sweep, args.max_minutes,
+                       args.seed or 0, args.wave_file)
+        return
+    if args.headless or args.benchmark or args.replay_path or args.soak is not None:
+        # SDL's dummy drivers give a working display surface without opening a window
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    # --- Initialization ---
+    startup = StartupTimer()
+    startup.mark("imports")
+    # Only the modules the game uses; the mixer is opened on a worker thread by load_assets()
+    pygame.display.init()
+    pygame.font.init()
+    startup.mark("pygame init")
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("NEON VOID: Reloaded")
+    startup.mark("display")
+    if not load_assets(screen, None if args.no_asset_cache else args.asset_cache):
+        pygame.quit()
+        return
+    startup.mark("assets")
+    windowed = not (args.benchmark or args.soak is not None or args.replay_path or args.headless)
+    if args.startup_report and not windowed:
+        startup.report()
+
+    if args.benchmark:
+        benchmark_collisions()
+        benchmark_narrowphase()
+        benchmark_particles()
+        benchmark_spawning()
+        benchmark_pooling()
+        benchmark_motion()
+        benchmark_waves()
+    elif args.soak is not None:
+        benchmark_soak(args.soak, args.seed or 0)
+    else:
+        wave_file = args.wave_file
+        profiler = FrameProfiler(trace_path=args.trace_path)
+        matched = True
+        try:
+            if args.replay_path:
+                matched = run_replay(args.replay_log, profiler, screen if args.render else None, wave_file)
+            elif args.headless:
+                run_headless(args.frames, profiler, args.seed or 0, screen if args.render else None,
+                             args.record_path, wave_file)
+            else:
+                run_window(screen, profiler, args.seed, args.record_path, wave_file,
+                           startup if args.startup_report else None)
+        finally:
+            profiler.close()
+        if not matched:
+            pygame.quit()
+            sys.exit(1)
+
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()